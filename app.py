@@ -24,8 +24,10 @@ if os.path.exists('/var/task/.env'):
                         if path and path not in sys.path:
                             sys.path.insert(0, path)
 
-# Fallback check for critical dependencies
-for module in ['pydantic', 'jinja2', 'github']:
+# Fallback check for critical dependencies. PyGithub is not checked here: the
+# handler talks to the REST API through requests, and importing it would pull
+# jwt/cryptography/nacl into every cold start for nothing
+for module in ['pydantic', 'jinja2']:
     try:
         importlib.import_module(module)
     except ImportError:
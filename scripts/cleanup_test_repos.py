@@ -1,11 +1,28 @@
 # scripts/cleanup_test_repos.py
 import os
+import json
+import time
+import threading
+import argparse
+import concurrent.futures
+import urllib.parse
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
+# Repositories created by the integration tests
+TEST_REPO_PREFIX = "temp-test-repo-"
+
+# ETags and bodies of previously fetched repository pages, reused via If-None-Match
+ETAG_CACHE_PATH = os.environ.get(
+    "CLEANUP_ETAG_CACHE",
+    os.path.expanduser("~/.cache/cleanup_test_repos_etags.json")
+)
+
 def get_env_var(name):
     """Get an environment variable or raise an error."""
     value = os.environ.get(name)
@@ -13,83 +30,294 @@ def get_env_var(name):
         raise ValueError(f"Environment variable {name} is not set.")
     return value
 
-def delete_repository(api_base_url, headers, org_name, repo_name):
-    """Delete a specific repository."""
+def create_session(headers, pool_size=16):
+    """Create a session whose connection pool is shared by all page fetches and deletes."""
+    session = requests.Session()
+    retry = Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "DELETE"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers)
+    return session
+
+class RateLimiter:
+    """Pause all delete workers together when GitHub signals rate limiting.
+
+    The primary limit is tracked from the X-RateLimit-Remaining/Reset headers of
+    every response; once fewer than `floor` requests remain, workers wait until
+    the reset time. Secondary limits (403 responses) pause workers for the
+    Retry-After interval, or an exponential backoff when none is given.
+    """
+
+    def __init__(self, floor=100):
+        self.floor = floor
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self):
+        """Block until any active rate-limit pause has elapsed."""
+        with self._lock:
+            delay = self._resume_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        """Hold back all workers for at least `seconds`."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.time() + seconds)
+
+    def update(self, response):
+        """Record the rate-limit headers of a response."""
+        remaining = response.headers.get("X-RateLimit-Remaining", "")
+        reset = response.headers.get("X-RateLimit-Reset", "")
+        if remaining.isdigit() and reset.isdigit() and int(remaining) < self.floor:
+            logging.warning("Only %s API requests remaining, pausing deletes until reset", remaining)
+            with self._lock:
+                self._resume_at = max(self._resume_at, float(reset))
+
+def is_secondary_rate_limit(response):
+    """Return True if the response is a secondary rate limit rejection."""
+    return response.status_code == 403 and (
+        "Retry-After" in response.headers or "secondary rate limit" in response.text.lower()
+    )
+
+def delete_repository(session, api_base_url, org_name, repo_name, rate_limiter=None, max_attempts=5):
+    """Delete a specific repository. Returns True if the repository was deleted."""
     delete_url = f"{api_base_url}/repos/{org_name}/{repo_name}"
+    rate_limiter = rate_limiter or RateLimiter()
     try:
-        response = requests.delete(
-            delete_url,
-            headers=headers,
-            verify=False  # Consider adding proper verification
-        )
+        for attempt in range(max_attempts):
+            rate_limiter.wait()
+            response = session.delete(
+                delete_url,
+                verify=False  # Consider adding proper verification
+            )
+            rate_limiter.update(response)
+            if is_secondary_rate_limit(response) and attempt < max_attempts - 1:
+                # Retry-After may also be an HTTP-date; back off exponentially then
+                retry_after = response.headers.get("Retry-After", "")
+                delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+                logging.warning("Secondary rate limit hit deleting %s, backing off %ss", repo_name, delay)
+                rate_limiter.pause(delay)
+                continue
+            break
         response.raise_for_status()  # Raise an exception for bad status codes
-        logging.info(f"Successfully deleted repository: {repo_name}")
+        logging.info("Successfully deleted repository: %s", repo_name)
+        return True
     except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to delete repository {repo_name}: {e}")
+        logging.error("Failed to delete repository %s: %s", repo_name, e)
         if e.response is not None:
-            logging.error(f"Response status: {e.response.status_code}")
-            logging.error(f"Response text: {e.response.text}")
+            logging.error("Response status: %s", e.response.status_code)
+            logging.error("Response text: %s", e.response.text)
         else:
             logging.error("No response received from the API.")
+        return False
 
-def list_and_archive_test_repos(api_base_url, headers, org_name):
-    """List all repositories in the org and delete those matching the pattern."""
-    repos_url = f"{api_base_url}/orgs/{org_name}/repos"
-    params = {'per_page': 100}  # Adjust per_page as needed
+def load_etag_cache(path):
+    """Load the page ETag cache, returning an empty cache if it is missing or unreadable."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_etag_cache(path, etag_cache):
+    """Persist the page ETag cache for the next run."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(etag_cache, f)
+    except OSError as e:
+        logging.warning("Could not write ETag cache %s: %s", path, e)
+
+def get_page(session, url, etag_cache, params=None):
+    """GET a page of results, revalidating a cached copy with If-None-Match.
+
+    Returns a (body, links) tuple. A 304 response carries no body and does not
+    count against the primary rate limit, so the cached body is reused.
+    """
+    key = requests.Request('GET', url, params=params).prepare().url
+    cached = etag_cache.get(key)
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    response = session.get(url, params=params, headers=headers, verify=False)
+    if response.status_code == 304 and cached:
+        logging.info("Page not modified, using cached copy: %s", key)
+        return cached["body"], cached["links"]
+    response.raise_for_status()
+    body = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        etag_cache[key] = {"etag": etag, "body": body, "links": response.links}
+    return body, response.links
+
+def fetch_repo_page(session, repos_url, page, etag_cache, per_page=100):
+    """Fetch a single page of the organization's repositories."""
+    logging.info("Fetching page %s of repositories...", page)
+    return get_page(session, repos_url, etag_cache, params={'per_page': per_page, 'page': page})
+
+def get_last_page(links):
+    """Return the last page number advertised in the Link header, or None if unknown."""
+    last_link = links.get('last')
+    if not last_link:
+        return None
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(last_link['url']).query)
+    try:
+        return int(query['page'][0])
+    except (KeyError, ValueError):
+        return None
+
+# Lists only repository names, a fraction of the size of the REST repository objects
+REPO_NAMES_QUERY = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor) {
+      nodes { name }
+      pageInfo { endCursor hasNextPage }
+    }
+  }
+}
+"""
+
+def get_graphql_url(api_base_url):
+    """Derive the GraphQL endpoint from the REST API base URL."""
+    base_url = api_base_url.rstrip('/')
+    if base_url.endswith('/api/v3'):
+        # GitHub Enterprise Server serves GraphQL at /api/graphql
+        return f"{base_url[:-len('/v3')]}/graphql"
+    return f"{base_url}/graphql"
+
+def fetch_repo_names_graphql(session, api_base_url, org_name):
+    """Yield pages of repository name nodes using GraphQL cursor pagination."""
+    graphql_url = get_graphql_url(api_base_url)
+    cursor = None
     page = 1
+    while True:
+        logging.info("Fetching page %s of repository names...", page)
+        response = session.post(graphql_url, json={
+            "query": REPO_NAMES_QUERY,
+            "variables": {"org": org_name, "cursor": cursor}
+        }, verify=False)
+        response.raise_for_status()
+        result = response.json()
+        if result.get("errors"):
+            raise RuntimeError(f"GraphQL query failed: {result['errors']}")
+        repositories = result["data"]["organization"]["repositories"]
+        yield repositories["nodes"]
+        if not repositories["pageInfo"]["hasNextPage"]:
+            break
+        cursor = repositories["pageInfo"]["endCursor"]
+        page += 1
+
+def log_request_error(message, error):
+    """Log a failed request along with GitHub's response, if there was one."""
+    logging.error("%s: %s", message, error)
+    response = getattr(error, "response", None)
+    if response is not None:
+        logging.error("Response status: %s", response.status_code)
+        logging.error("Response text: %s", response.text)
+
+def list_test_repos(session, api_base_url, org_name, executor, etag_cache, use_graphql=False):
+    """Return the names of every repository in the org that matches the test prefix.
+
+    The first REST page is fetched on its own to read the last page number from
+    the Link header; the remaining pages are then fetched concurrently. If the
+    last page is not advertised, pages are walked sequentially via rel="next".
+    A page that fails to load is logged and skipped, so one bad page does not
+    stop the run. With use_graphql, names are listed by cursor instead.
+    """
+    repos_url = f"{api_base_url}/orgs/{org_name}/repos"
+    pages = []
+
+    if use_graphql:
+        pages.extend(fetch_repo_names_graphql(session, api_base_url, org_name))
+    else:
+        repos, links = fetch_repo_page(session, repos_url, 1, etag_cache)
+        pages.append(repos)
+
+        last_page = get_last_page(links)
+        if last_page:
+            page_futures = {
+                executor.submit(fetch_repo_page, session, repos_url, page, etag_cache): page
+                for page in range(2, last_page + 1)
+            }
+            for page_future in concurrent.futures.as_completed(page_futures):
+                try:
+                    pages.append(page_future.result()[0])
+                except requests.exceptions.RequestException as e:
+                    log_request_error(f"Failed to fetch page {page_futures[page_future]}", e)
+        else:
+            # Fall back to following the Link header one page at a time
+            while 'next' in links:
+                repos, links = get_page(session, links['next']['url'], etag_cache)
+                pages.append(repos)
+
+    names = [
+        name for repos in pages for name in (repo.get("name") for repo in repos)
+        if name and name.startswith(TEST_REPO_PREFIX)
+    ]
+    logging.info("Found %s repositories, %s to delete.", sum(len(repos) for repos in pages), len(names))
+    return names
+
+def list_and_archive_test_repos(session, api_base_url, org_name, max_workers=16, etag_cache=None, use_graphql=False):
+    """List all repositories in the org and delete those matching the pattern.
+
+    Every page is listed before any delete is submitted: deleting while later
+    pages are still being fetched by page number shifts the listing, so some
+    repositories would slip between pages and be skipped. The deletes then run
+    concurrently on the same thread pool.
+
+    With use_graphql, names are listed through the GraphQL API instead. The
+    responses are much smaller, but cursor pages are fetched one after another
+    and cannot be revalidated with ETags.
+    """
+    etag_cache = {} if etag_cache is None else etag_cache
+    rate_limiter = RateLimiter()
     deleted_count = 0
 
-    logging.info(f"Fetching repositories from organization: {org_name}")
+    logging.info("Fetching repositories from organization: %s", org_name)
 
-    while True:
-        params['page'] = page
-        logging.info(f"Fetching page {page} of repositories...")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         try:
-            response = requests.get(repos_url, headers=headers, params=params, verify=False)
-            response.raise_for_status()
-            repos = response.json()
-            logging.info(f"Found {len(repos)} repositories on page {page}.")
-
-            if not repos:
-                logging.info("No more repositories found.")
-                break
-
-            logging.info(f"Processing page {page} of repositories...")
-            for repo in repos:
-                repo_name = repo.get("name")
-                is_archived = repo.get("archived", False)
-                if repo_name and repo_name.startswith("temp-test-repo-"):
-                    logging.info(f"Found test repository: {repo_name}")
-                    logging.info(f"Deleting repository: {repo_name}")
-                    delete_repository(api_base_url, headers, org_name, repo_name)
-                    logging.info(f"Deleted repository: {repo_name}")
-                    deleted_count += 1
-
-            # Check if there's a next page (GitHub uses Link header)
-            if 'next' not in response.links:
-                break
-            # Use the URL provided in the Link header for the next page
-            # Need to update repos_url for the next iteration
-            next_link = response.links.get('next')
-            if next_link:
-                repos_url = next_link['url']
-                page += 1 # Increment page conceptually, actual page number is in the URL
-            else:
-                 break # No next link header means we are done
-
+            to_delete = list_test_repos(session, api_base_url, org_name, executor, etag_cache, use_graphql)
         except requests.exceptions.RequestException as e:
-            logging.error(f"Failed to fetch repositories: {e}")
-            if e.response is not None:
-                logging.error(f"Response status: {e.response.status_code}")
-                logging.error(f"Response text: {e.response.text}")
-            break
+            log_request_error("Failed to fetch repositories", e)
+            to_delete = []
         except Exception as e:
-            logging.error(f"An unexpected error occurred: {e}")
-            break
+            logging.error("An unexpected error occurred: %s", e)
+            to_delete = []
 
-    logging.info(f"Finished cleanup. Deleted {deleted_count} test repositories during this run.")
+        futures = [
+            executor.submit(delete_repository, session, api_base_url, org_name, repo_name, rate_limiter)
+            for repo_name in to_delete
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                deleted_count += bool(future.result())
+            except Exception as e:
+                logging.error("Delete worker failed: %s", e)
+
+    logging.info("Finished cleanup. Deleted %s test repositories during this run.", deleted_count)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete temporary test repositories from a GitHub organization.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("DELETE_CONCURRENCY", "16")),
+        help="Number of concurrent delete requests (default: $DELETE_CONCURRENCY or 16)"
+    )
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="List repository names through the GraphQL API instead of the REST API"
+    )
+    args = parser.parse_args()
+
     try:
         token = get_env_var("GITHUB_TOKEN")
         api_url = get_env_var("GITHUB_API")
@@ -109,11 +337,16 @@ if __name__ == "__main__":
         except ImportError:
             logging.warning("urllib3 not found, cannot disable InsecureRequestWarning.")
 
-        list_and_archive_test_repos(api_url, req_headers, org)
+        # Size the pool to the worker count so concurrent deletes never wait on a connection
+        etag_cache = load_etag_cache(ETAG_CACHE_PATH)
+        with create_session(req_headers, pool_size=args.workers) as session:
+            list_and_archive_test_repos(session, api_url, org, max_workers=args.workers,
+                                        etag_cache=etag_cache, use_graphql=args.graphql)
+        save_etag_cache(ETAG_CACHE_PATH, etag_cache)
 
     except ValueError as e:
         logging.error(e)
         exit(1)
     except Exception as e:
-        logging.error(f"An unexpected error occurred during script execution: {e}")
+        logging.error("An unexpected error occurred during script execution: %s", e)
         exit(1)
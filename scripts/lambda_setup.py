@@ -5,6 +5,9 @@ Handles installation of dependencies and verification of Lambda environment
 """
 import os
 import sys
+import shlex
+import hashlib
+import compileall
 import subprocess
 import shutil
 from pathlib import Path
@@ -13,24 +16,57 @@ from pathlib import Path
 LAMBDA_TASK_ROOT = '/var/task'
 TMP_DIR = '/tmp'
 PYTHON_VERSION = "3.11"  # Match the Lambda container's Python version
+PRUNE_DIR_NAMES = {"tests", "test"}  # Test suites bundled inside installed packages
+WHEELHOUSE_DIR = f"{TMP_DIR}/wheelhouse"  # Filled by scripts/prefetch_wheels.py
 
-def run_command(cmd, check=True):
-    """Run a shell command and print its output"""
-    print(f"Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, text=True, check=check,
+def run_command(cmd, check=True, cwd=None, capture=False):
+    """Run a command given as an argv list.
+
+    Output goes straight to this process's stdout/stderr unless capture is set,
+    in which case it is collected on the result and printed afterwards.
+    """
+    # Flush so our own progress lines stay ordered with the child's output
+    print(f"Running: {shlex.join(cmd)}", flush=True)
+    if not capture:
+        return subprocess.run(cmd, text=True, check=check, cwd=cwd)
+    result = subprocess.run(cmd, text=True, check=check, cwd=cwd,
                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     print(result.stdout)
     return result
 
+def _link_or_copy(src, dest):
+    """Hardlink a file into place, falling back to a byte copy"""
+    try:
+        if os.path.lexists(dest):
+            os.unlink(dest)
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+def _copy_function(src, dest):
+    """Pick hardlinking when src and dest's parent are on the same filesystem"""
+    dest_parent = os.path.dirname(os.path.abspath(dest))
+    same_device = os.stat(src).st_dev == os.stat(dest_parent).st_dev
+    return _link_or_copy if same_device else shutil.copy2
+
 def copy_directory(src, dest):
-    """Copy a directory to destination"""
+    """Copy a directory to destination, hardlinking files when on the same filesystem"""
     print(f"Copying '{src}' to '{dest}'")
-    shutil.copytree(src, dest, dirs_exist_ok=True)
+    shutil.copytree(src, dest, dirs_exist_ok=True, copy_function=_copy_function(src, dest))
 
 def copy_file(src, dest):
-    """Copy a file to destination"""
+    """Copy a file to destination, hardlinking it when on the same filesystem"""
     print(f"Copying '{src}' to '{dest}'")
-    shutil.copy2(src, dest)
+    _copy_function(src, dest)(src, dest)
+
+def find_wheelhouse():
+    """Return the prefetched wheel directory for the current requirements, if any"""
+    with open(f"{TMP_DIR}/requirements.txt", "rb") as f:
+        key = hashlib.sha256(f.read()).hexdigest()[:12]
+    wheelhouse = f"{WHEELHOUSE_DIR}/{key}"
+    if os.path.isdir(wheelhouse) and any(name.endswith(".whl") for name in os.listdir(wheelhouse)):
+        return wheelhouse
+    return None
 
 def install_dependencies():
     """Install Python dependencies"""
@@ -40,19 +76,69 @@ def install_dependencies():
     site_packages = f"{LAMBDA_TASK_ROOT}/lib/python{PYTHON_VERSION}/site-packages"
     os.makedirs(site_packages, exist_ok=True)
     
-    # Install dependencies directly to the site-packages directory
-    run_command(f"pip3 install --no-cache-dir -r {TMP_DIR}/requirements.txt -t {LAMBDA_TASK_ROOT}")
-    
-    # Explicitly install critical dependencies
-    print("=== Explicitly installing critical dependencies ===")
-    run_command(f"pip3 install --no-cache-dir pydantic jinja2 PyGithub -t {LAMBDA_TASK_ROOT}")
+    # Install requirements, the critical dependencies and the package itself in a
+    # single run so the resolver only runs once. Prefer uv, which resolves and
+    # downloads in parallel, when it is available in the build image.
+    packages = [
+        "-r", f"{TMP_DIR}/requirements.txt", "pydantic", "jinja2",
+        "-e", TMP_DIR
+    ]
+    uv = shutil.which("uv")
+    if uv:
+        # Keep bytecode compilation on: /var/task is read-only at runtime, so
+        # Lambda cannot write .pyc files itself
+        install_cmd = [uv, "pip", "install", "--no-cache", "--compile-bytecode",
+                       *packages, "--target", LAMBDA_TASK_ROOT]
+    else:
+        os.environ["PIP_NO_INPUT"] = "1"
+        install_cmd = ["pip3", "install", "--no-cache-dir", "--disable-pip-version-check",
+                       *packages, "-t", LAMBDA_TASK_ROOT]
+
+    # Install offline from prefetched wheels when they match requirements.txt,
+    # and fall back to the package index if anything is missing from them
+    installed = False
+    wheelhouse = find_wheelhouse()
+    if wheelhouse:
+        print(f"Installing from prefetched wheels in {wheelhouse}")
+        result = run_command([*install_cmd, "--no-index", "--find-links", wheelhouse], check=False)
+        installed = result.returncode == 0
+        if not installed:
+            print("Offline install failed, falling back to the package index")
+    if not installed:
+        run_command(install_cmd)
     
     # Create a .pth file to ensure the Lambda runtime can find the packages
     with open(f"{LAMBDA_TASK_ROOT}/lambda_path.pth", "w") as f:
         f.write(f"{LAMBDA_TASK_ROOT}\n")
-    
-    print("=== Installing package in development mode ===")
-    run_command(f"pip3 install --no-cache-dir -e {TMP_DIR} -t {LAMBDA_TASK_ROOT} -v")
+
+def _prune_tree(path):
+    """Recursively remove test suite directories below a package directory"""
+    removed = 0
+    for entry in os.scandir(path):
+        if not entry.is_dir(follow_symlinks=False):
+            continue
+        if entry.name in PRUNE_DIR_NAMES:
+            shutil.rmtree(entry.path)
+            removed += 1
+        else:
+            removed += _prune_tree(entry.path)
+    return removed
+
+def prune_dependencies():
+    """Strip test suites that installed packages ship but Lambda never imports.
+
+    Only directories nested inside a top-level package are removed. Bytecode is
+    kept because /var/task is read-only at runtime, and .dist-info metadata is
+    kept because packages read versions and entry points from it.
+    """
+    print("=== Pruning test suites from installed dependencies ===")
+    removed = 0
+    for entry in os.scandir(LAMBDA_TASK_ROOT):
+        if (entry.is_dir(follow_symlinks=False)
+                and entry.name != "template_automation"
+                and not entry.name.endswith(".dist-info")):
+            removed += _prune_tree(entry.path)
+    print(f"Removed {removed} test directories")
 
 def verify_dependencies():
     """Verify that key dependencies are installed correctly"""
@@ -60,10 +146,10 @@ def verify_dependencies():
     
     # Print Python path for debugging
     print("Python sys.path:")
-    run_command("python3 -c 'import sys; print(sys.path)'")
+    run_command(["python3", "-c", "import sys; print(sys.path)"])
     
     # Check key dependencies
-    dependencies = ['pydantic', 'jinja2', 'github']  # Add critical dependencies here
+    dependencies = ['pydantic', 'jinja2']  # Add critical dependencies here
     with open(f"{TMP_DIR}/requirements.txt") as f:
         for line in f:
             line = line.strip()
@@ -72,10 +158,31 @@ def verify_dependencies():
                 if pkg and pkg not in dependencies:
                     dependencies.append(pkg)
    
-    # Use the Lambda container's Python to verify imports
-    for dep in dependencies:
-        cmd = f"cd {LAMBDA_TASK_ROOT} && python3 -c 'import {dep}; print(f\"{dep} installed successfully\")' || echo '{dep} not installed correctly'"
-        run_command(cmd, check=False)
+    # Use the Lambda container's Python to verify all imports in a single interpreter
+    script = (
+        "import importlib\n"
+        f"for dep in {dependencies!r}:\n"
+        "    try:\n"
+        "        importlib.import_module(dep)\n"
+        "        print(f'{dep} installed successfully')\n"
+        "    except Exception:\n"
+        "        print(f'{dep} not installed correctly')\n"
+    )
+    run_command(["python3", "-c", script], check=False, cwd=LAMBDA_TASK_ROOT)
+
+def compile_function_code():
+    """Write bytecode for the function code copied into the task root.
+
+    Dependencies are compiled by the installer, but app.py and the package are
+    copied in afterwards, and /var/task is read-only at runtime so Lambda would
+    otherwise parse them from source on every cold start. The .py files are
+    kept so tracebacks still show source lines.
+    """
+    print("=== Compiling function code to bytecode ===")
+    ok = compileall.compile_file(f"{LAMBDA_TASK_ROOT}/app.py", quiet=1)
+    ok = compileall.compile_dir(f"{LAMBDA_TASK_ROOT}/template_automation", quiet=1, workers=0) and ok
+    if not ok:
+        raise RuntimeError("Failed to compile function code")
 
 def setup_lambda_environment():
     """Main function to set up the Lambda environment"""
@@ -83,11 +190,12 @@ def setup_lambda_environment():
     
     # Debug info
     print("=== Python and pip versions ===")
-    run_command("python3 --version")
-    run_command("pip3 --version")
+    run_command(["python3", "--version"])
+    run_command(["pip3", "--version"])
     
     # Install dependencies
     install_dependencies()
+    prune_dependencies()
     
     # Copy app.py to Lambda task root
     print("=== Copying app.py to Lambda task root ===")
@@ -96,6 +204,7 @@ def setup_lambda_environment():
     # Copy template_automation directory
     print("=== Copying template_automation package ===")
     copy_directory(f"{TMP_DIR}/template_automation", f"{LAMBDA_TASK_ROOT}/template_automation")
+    compile_function_code()
     
     # Create a wrapper script that ensures the Python path is set correctly
     with open(f"{LAMBDA_TASK_ROOT}/.env", "w") as f:
@@ -106,12 +215,12 @@ def setup_lambda_environment():
     
     # List installed packages
     print("=== Listing installed Python packages ===")
-    run_command("pip3 list")
+    run_command(["pip3", "list"])
     
     # Verify task directory structure
     print("=== Verifying Lambda task root contents ===")
-    run_command(f"ls -la {LAMBDA_TASK_ROOT}")
-    run_command(f"ls -la {LAMBDA_TASK_ROOT}/template_automation")
+    run_command(["ls", "-la", LAMBDA_TASK_ROOT])
+    run_command(["ls", "-la", f"{LAMBDA_TASK_ROOT}/template_automation"])
     
     # Final check - try to import critical modules from the Lambda environment
     print("=== Testing key imports from Lambda environment ===")
@@ -128,15 +237,8 @@ try:
     print("jinja2 successfully imported:", jinja2.__file__)
 except ImportError as e:
     print("Error importing jinja2:", str(e))
-try:
-    import github
-    print("github successfully imported:", github.__file__)
-except ImportError as e:
-    print("Error importing github:", str(e))
 """
-    with open(f"{LAMBDA_TASK_ROOT}/test_imports.py", "w") as f:
-        f.write(test_import)
-    run_command(f"cd {LAMBDA_TASK_ROOT} && python3 test_imports.py")
+    run_command(["python3", "-c", test_import], cwd=LAMBDA_TASK_ROOT)
 
 if __name__ == "__main__":
     setup_lambda_environment()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Prefetch the Lambda image's dependency wheels into a local wheelhouse
+so the container build can install them without going to the network
+"""
+import argparse
+import hashlib
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+# Constants
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+WHEELHOUSE_DIR = PROJECT_ROOT / "wheelhouse"
+PYTHON_VERSION = "3.11"  # Match the Lambda container's Python version
+PLATFORM = "manylinux2014_x86_64"
+# Installed alongside requirements.txt by lambda_setup.py, plus what pip needs
+# to build the editable install of this project
+EXTRA_PACKAGES = ["pydantic", "jinja2", "boto3", "requests", "setuptools", "wheel"]
+
+def requirements_key(requirements_file):
+    """Key the wheelhouse on the requirements contents so edits miss the cache"""
+    return hashlib.sha256(Path(requirements_file).read_bytes()).hexdigest()[:12]
+
+def prefetch_wheels(requirements_file, wheelhouse_dir):
+    """Download binary wheels for the Lambda platform into a keyed directory"""
+    dest = Path(wheelhouse_dir) / requirements_key(requirements_file)
+    dest.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        sys.executable, "-m", "pip", "download",
+        "--only-binary=:all:",
+        "--platform", PLATFORM,
+        "--python-version", PYTHON_VERSION,
+        "-r", str(requirements_file), *EXTRA_PACKAGES,
+        "-d", str(dest)
+    ]
+    print(f"Running: {shlex.join(cmd)}", flush=True)
+    subprocess.run(cmd, check=True)
+    print(f"Wheels saved to {dest}")
+    return dest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prefetch dependency wheels for the Lambda image build")
+    parser.add_argument("--requirements", default=str(PROJECT_ROOT / "requirements.txt"),
+                        help="Requirements file to download wheels for")
+    parser.add_argument("--dest", default=str(WHEELHOUSE_DIR),
+                        help="Wheelhouse root directory")
+    args = parser.parse_args()
+    prefetch_wheels(args.requirements, args.dest)
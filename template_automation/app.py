@@ -28,6 +28,14 @@ Configuration:
         GITHUB_COMMIT_AUTHOR_NAME: Name for commits (default: Template Automation)
         GITHUB_COMMIT_AUTHOR_EMAIL: Email for commits (default: automation@example.com)
         TEMPLATE_SOURCE_VERSION: Version/tag/SHA to use from template
+        GITHUB_TOKEN_CACHE_TTL: Seconds to reuse a fetched token across warm invocations (default: 900)
+        GITHUB_TOKEN_STALE_GRACE: Seconds a stale token is served while it refreshes (default: 900)
+        IDEMPOTENCY_TTL: Seconds a completed request is remembered for retries (default: 3600)
+        GENERATED_BRANCH_TIMEOUT: Longest wait, in seconds, for a repository created from the
+            template to get its default branch (default: 60, and never more than half the
+            invocation's remaining time)
+        PARAMETERS_SECRETS_EXTENSION_HTTP_PORT: Read the token through the Parameters and
+            Secrets Lambda Extension on this port (usually 2773) instead of calling Secrets Manager
 
 See Also:
     - GitHubClient: Handles all GitHub API interactions
@@ -36,20 +44,24 @@ See Also:
 """
 
 import os
+import re
+import json
+import hashlib
+import functools
 import logging
 import time
-import traceback
-import boto3
-from botocore.exceptions import ClientError
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 from .models import TemplateInput, GitHubConfig
 from .template_manager import TemplateManager
 from .github_client import GitHubClient
 import requests
 
-# Initialize the logger
-logger = logging.getLogger()
-logger.setLevel("INFO")  # Set to "ERROR" to reduce logging messages.
+# Initialize the logger; the level is set on the package logger so that
+# github_client and template_manager records are emitted at the same level
+logger = logging.getLogger(__name__)
+logging.getLogger(__package__).setLevel("INFO")  # Set to "ERROR" to reduce logging messages.
 
 # Required environment variables
 REQUIRED_ENV_VARS = [
@@ -71,6 +83,11 @@ if not IN_SPHINX_BUILD:
 
 # Get environment variables with defaults for documentation
 GITHUB_TOKEN_SECRET_NAME = os.environ.get("GITHUB_TOKEN_SECRET_NAME", "docs-placeholder")
+GITHUB_API = os.environ.get("GITHUB_API", "https://api.github.com")
+GITHUB_ORG_NAME = os.environ.get("GITHUB_ORG_NAME", "docs-placeholder")
+TEMPLATE_REPO_NAME = os.environ.get("TEMPLATE_REPO_NAME", "docs-placeholder")
+COMMIT_AUTHOR_NAME = os.environ.get("GITHUB_COMMIT_AUTHOR_NAME", "Template Automation")
+COMMIT_AUTHOR_EMAIL = os.environ.get("GITHUB_COMMIT_AUTHOR_EMAIL", "automation@example.com")
 DEFAULT_CONFIG_FILE = os.environ.get("TEMPLATE_CONFIG_FILE", "config.json")
 DEFAULT_TOPICS = os.environ.get("TEMPLATE_TOPICS", "infrastructure").split(",")
 PARAM_STORE_PREFIX = os.environ.get("PARAM_STORE_PREFIX", "/template-automation")
@@ -78,6 +95,49 @@ TEMPLATE_SOURCE_VERSION: Optional[str] = os.environ.get("TEMPLATE_SOURCE_VERSION
 # Add SSL verification environment variable with default to True (secure)
 VERIFY_SSL = os.environ.get("VERIFY_SSL", "true").lower() != "false"
 
+# Back off adaptively when Secrets Manager throttles and keep the connection alive
+BOTO_CLIENT_CONFIG = {
+    "retries": {"mode": "adaptive", "max_attempts": 5},
+    "tcp_keepalive": True,
+    "connect_timeout": 2,
+    "read_timeout": 10
+}
+
+# Threads for the independent steps after the template is copied
+POST_CLONE_WORKERS = 4
+
+# Matches /api/v3 and anything after it, in a single scan of the URL
+_API_V3_RE = re.compile(r'/api/v3.*$')
+
+# How long a token fetched from Secrets Manager is reused by a warm container,
+# and how much longer a stale one may be served while it is refreshed
+TOKEN_CACHE_TTL_SECONDS = int(os.environ.get("GITHUB_TOKEN_CACHE_TTL", "900"))
+TOKEN_STALE_GRACE_SECONDS = int(os.environ.get("GITHUB_TOKEN_STALE_GRACE", "900"))
+
+# Port of the AWS Parameters and Secrets Lambda Extension, when it is installed
+SECRETS_EXTENSION_PORT = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT")
+
+# Lazily initialized per-container state, reused across warm invocations
+_SM_CLIENT = None
+_TOKEN_CACHE = {"value": None, "expires_at": 0.0, "lock": threading.Lock()}
+_GITHUB_CLIENTS = {}
+_COMPLETED_REQUESTS = {}
+_COMPLETED_REQUESTS_LOCK = threading.Lock()
+
+# How long a completed request is remembered so Lambda retries of the same
+# event that land in the same container return the earlier result. This is a
+# best-effort shortcut only; retries elsewhere rely on the handler resuming an
+# existing repo-init branch and pull request
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_TTL", "3600"))
+
+# Longest wait for GitHub to populate a repository generated from the template
+GENERATED_BRANCH_TIMEOUT_SECONDS = float(os.environ.get("GENERATED_BRANCH_TIMEOUT", "60"))
+
+if not VERIFY_SSL:
+    # Suppress urllib3 warnings about insecure connections once per container
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 # Keep imports and logging setup from here
 # The GitHubClient class has been moved to github_client.py
 
@@ -94,6 +154,13 @@ def lambda_handler(event: dict, context) -> dict:
     7. Creates a pull request with the changes
     8. Optionally triggers initialization workflow
 
+    Retries are safe: a completed request is answered from a best-effort,
+    per-container cache, and otherwise a repository that already has the
+    repo-init branch is not copied into again, its config is only committed
+    if it differs, and an open pull request from that branch is reused. A
+    repository GitHub is still generating from the template is never written
+    to; if it is not ready in time the invocation fails and a retry resumes it.
+
     Args:
         event: AWS Lambda event containing:
             project_name (str): Name for the new repository
@@ -108,138 +175,432 @@ def lambda_handler(event: dict, context) -> dict:
             pull_request_url (str, optional): URL of the config pull request
     """
     try:
-        logger.info(f"Processing template request: {event}")
+        logger.info("Processing template request: %s", event)
 
         # Parse and validate input
         template_input = TemplateInput(**event)
-        logger.info(f"Validated input for project: {template_input.project_name}")
+        logger.info("Validated input for project: %s", template_input.project_name)
+
+        # A retried event that already completed in this container returns the
+        # earlier result instead of repeating the GitHub writes
+        request_key = get_request_key(template_input)
+        with _COMPLETED_REQUESTS_LOCK:
+            completed = _COMPLETED_REQUESTS.get(request_key)
+        if completed and time.monotonic() < completed[0]:
+            logger.info("Request for %s already completed, returning cached result", template_input.project_name)
+            return dict(completed[1])
 
         # Get GitHub configuration from environment/parameter store
-        github_config = GitHubConfig(
-            api_base_url=get_github_base_url(os.environ["GITHUB_API"]),
-            org_name=os.environ["GITHUB_ORG_NAME"],
-            commit_author_name=os.environ.get("GITHUB_COMMIT_AUTHOR_NAME", "Template Automation"),
-            commit_author_email=os.environ.get("GITHUB_COMMIT_AUTHOR_EMAIL", "automation@example.com"),
-            token=get_github_token(),
-            template_repo_name=os.environ["TEMPLATE_REPO_NAME"],
-            config_file_name=DEFAULT_CONFIG_FILE,
-            source_version=TEMPLATE_SOURCE_VERSION,
+        github_config = get_static_github_config().model_copy(
+            update={"token": get_github_token()}
         )
 
         # Initialize clients
-        github = GitHubClient(
-            api_base_url=github_config.api_base_url,
-            token=github_config.token,
-            org_name=github_config.org_name,
-            commit_author_name=github_config.commit_author_name,
-            commit_author_email=github_config.commit_author_email,
-            verify_ssl=VERIFY_SSL  # Pass SSL verification setting
-        )
+        github = get_github_client(github_config)
+        github.reset_rate_limit_budget()
         
         # Check if the template repository exists
         template_repo_name = github_config.template_repo_name
-        try:
-            template_repo = github.get_repository(template_repo_name)
-            logger.info(f"Using template repository: {template_repo_name}")
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                logger.error(f"Template repository not found: {template_repo_name}")
-                raise ValueError(f"Template repository '{template_repo_name}' does not exist in organization {github_config.org_name}")
-            raise
+        template_repo = github.get_repository_info(template_repo_name)
+        if template_repo is None:
+            logger.error("Template repository not found: %s", template_repo_name)
+            raise ValueError(
+                f"Template repository '{template_repo_name}' does not exist "
+                f"in organization {github_config.org_name}"
+            )
+        logger.info("Using template repository: %s", template_repo_name)
             
-        # Initialize TemplateManager with proper parameters
-        template_mgr = TemplateManager(template_repo_name=github_config.template_repo_name)
+        # Reuse the container's TemplateManager and its Jinja environment
+        template_mgr = get_template_manager()
 
         # Create repository from template
         repo_name = template_input.project_name
         
-        # Create a new empty repository first
-        repo = github.get_repository(repo_name, create=True, owning_team=template_input.owning_team)
-        
-        # Ensure the repository has a default branch by creating a README if needed
-        default_branch = None
+        # Prefer GitHub's template generate endpoint, which creates the
+        # repository with the template's files in one request
+        repo = None
+        generated = False
         try:
-            # Try to get the default branch
-            default_branch = repo.get("default_branch", "main")
-            github.get_branch(repo_name, default_branch)
-            logger.info(f"Repository has default branch: {default_branch}")
-        except requests.exceptions.HTTPError:
-            # No default branch found, create a README to initialize the repository
-            logger.info(f"No default branch found, initializing repository with README.md")
-            github.create_readme_file(repo_name)
-            
-            # Wait for branch to be created and get the repository again
-            time.sleep(2)
+            repo = github.get_repository(repo_name, owning_team=template_input.owning_team)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
             try:
-                repo = github.get_repository(repo_name)
-                default_branch = repo.get("default_branch", "main")
-                logger.info(f"Repository initialized with default branch: {default_branch}")
-            except Exception as e:
-                logger.error(f"Failed to get updated repository info: {str(e)}")
-                raise ValueError("Repository was created but could not be initialized with a default branch")
-        
-        # Clone all files from template repository to the new repository
-        template_repo_name = github_config.template_repo_name
-        logger.info(f"Copying all files from template repository {template_repo_name} to {repo_name}")
-        try:
-            github.clone_repository_contents(
-                source_repo_name=template_repo_name,
-                target_repo_name=repo_name,
-                source_branch="main",  # Default branch of template
-                target_branch=default_branch,
-                commit_message="Initial setup from template repository"
-            )
-            logger.info(f"Successfully copied all files from {template_repo_name} to {repo_name}")
-        except Exception as e:
-            logger.error(f"Error copying files from template: {str(e)}")
-            logger.info("Continuing with repository setup even though template copying failed")
+                repo = github.create_repository_from_template(template_repo_name, repo_name)
+                generated = True
+            except requests.exceptions.HTTPError as generate_err:
+                if generate_err.response is None or generate_err.response.status_code not in (415, 422):
+                    raise
+                logger.info("Template generation unavailable for %s, copying files instead: %s",
+                            template_repo_name, generate_err)
 
-        # Create feature branch for template configuration
+        # A repository that already existed may carry an earlier attempt's
+        # template copy and config branch, which must not be redone
         feature_branch = "repo-init"  # Use consistent branch name instead of timestamp-based name
-        github.create_branch(repo_name, feature_branch, from_ref=default_branch)
-
-        # Write template configuration
-        import json
-        github.write_file(
-            repo=repo,
-            path=DEFAULT_CONFIG_FILE,
-            content=json.dumps(template_input.template_settings, indent=2),
-            branch=feature_branch,
-            commit_message=f"Initialize {DEFAULT_CONFIG_FILE} from template"
-        )
+        resumed_head = None
+        grant_team = generated and template_input.owning_team
+        if repo is not None and not generated:
+            resumed_head = _get_branch_head(github, repo_name, feature_branch)
+            if resumed_head is not None:
+                logger.info("Resuming earlier setup of %s from its %s branch", repo_name, feature_branch)
+            elif (repo.get("template_repository") or {}).get("name") == template_repo_name:
+                # An earlier attempt generated it; GitHub fills it in, not us
+                logger.info("Resuming setup of %s, generated from %s", repo_name, template_repo_name)
+                generated = True
 
-        # Set repository topics
-        github.update_repository_topics(repo_name, DEFAULT_TOPICS)
+        if not generated and repo is None:
+            # Create a new empty repository first
+            repo = github.get_repository(repo_name, create=True, owning_team=template_input.owning_team)
 
-        # Create pull request with template configuration
-        pr_details = template_mgr.render_pr_details(
-            repo_name=repo_name,
-            workflow_files=[DEFAULT_CONFIG_FILE]
-        )
+        # Once the repository exists, topics, team permission and the PR text
+        # do not depend on its contents, so run them alongside the template
+        # copy and the config commit
+        with ThreadPoolExecutor(max_workers=POST_CLONE_WORKERS) as executor:
+            side_futures = [executor.submit(
+                github.update_repository_topics, repo_name, DEFAULT_TOPICS,
+                current_topics=repo.get("topics")
+            )]
+            if grant_team:
+                side_futures.append(executor.submit(_grant_team_admin, github, repo_name, template_input.owning_team))
+            pr_details_future = executor.submit(
+                template_mgr.render_pr_details,
+                repo_name=repo_name,
+                workflow_files=[DEFAULT_CONFIG_FILE]
+            )
+
+            if generated:
+                # Generated repositories get the template's default branch, which
+                # is populated asynchronously
+                default_branch = template_repo["default_branch"] or repo.get("default_branch", "main")
+                try:
+                    default_head = github.wait_for_branch(
+                        repo_name, default_branch, timeout=get_generated_branch_timeout(context)
+                    )["commit"]["sha"]
+                except ValueError:
+                    # Writing to the repository now would race GitHub's own
+                    # initial commit, so fail and let a retry resume it
+                    logger.warning("Repository %s is still being generated from %s; a retry will resume it",
+                                   repo_name, template_repo_name)
+                    raise
+
+            if not generated and resumed_head is not None:
+                # The template was copied before the branch was created
+                default_branch = repo.get("default_branch", "main")
+            elif not generated:
+                default_branch, default_head = _initialize_and_copy_template(github, repo, template_repo)
+
+            # Create feature branch for template configuration
+            config_content = json.dumps(template_input.template_settings, indent=2)
+            if resumed_head is None:
+                feature_head = github.create_branch(
+                    repo_name, feature_branch, from_ref=default_branch, from_sha=default_head
+                )
+                needs_config = True
+            else:
+                feature_head = resumed_head
+                needs_config = _read_file_or_none(github, repo, DEFAULT_CONFIG_FILE, feature_branch) != config_content
+
+            # Write template configuration in a single GraphQL commit on the new branch
+            if needs_config:
+                github.create_commit_on_branch(
+                    repo_name=repo_name,
+                    branch=feature_branch,
+                    files={DEFAULT_CONFIG_FILE: config_content},
+                    commit_message=f"Initialize {DEFAULT_CONFIG_FILE} from template",
+                    expected_head_oid=feature_head
+                )
+
+            for future in side_futures:
+                future.result()
+            pr_details = pr_details_future.result()
         
-        pr = github.create_pull_request(
-            repo_name=repo_name,
-            title=pr_details["title"],
-            body=pr_details["body"],
-            head_branch=feature_branch,
-            base_branch=default_branch
-        )
+        pr = None
+        if resumed_head is not None:
+            pr = github.find_pull_request(repo_name, feature_branch, default_branch)
+        if pr is None:
+            pr = github.create_pull_request(
+                repo_name=repo_name,
+                title=pr_details["title"],
+                body=pr_details["body"],
+                head_branch=feature_branch,
+                base_branch=default_branch
+            )
 
         # The initialize.yml workflow will run automatically when the PR is created
         # since it's configured to trigger on pull_request events with repo-init as the head branch
         
-        return {
+        result = {
             "repository_url": repo["html_url"],
             "pull_request_url": pr["html_url"] if pr else None
         }
+        now = time.monotonic()
+        with _COMPLETED_REQUESTS_LOCK:
+            for key in [key for key, (expires_at, _) in _COMPLETED_REQUESTS.items() if expires_at <= now]:
+                del _COMPLETED_REQUESTS[key]
+            _COMPLETED_REQUESTS[request_key] = (now + IDEMPOTENCY_TTL_SECONDS, result)
+        return result
     except Exception as e:
-        logger.error(f"Failed to process template request: {str(e)}")
-        logger.debug(traceback.format_exc())
+        logger.error("Failed to process template request: %s", e)
+        # exc_info defers formatting the traceback until a DEBUG record is emitted
+        logger.debug("Traceback for failed template request", exc_info=True)
         raise
 
 
+def get_generated_branch_timeout(context) -> float:
+    """Work out how long to wait for a generated repository's default branch.
+
+    Args:
+        context: AWS Lambda context object, or None outside Lambda
+
+    Returns:
+        float: GENERATED_BRANCH_TIMEOUT_SECONDS, limited to half the time the
+        invocation has left so the copy, branch and pull request still fit
+    """
+    timeout = GENERATED_BRANCH_TIMEOUT_SECONDS
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        timeout = min(timeout, context.get_remaining_time_in_millis() / 2000)
+    return max(timeout, 0.0)
+
+
+def _get_branch_head(github: GitHubClient, repo_name: str, branch: str) -> Optional[str]:
+    """Return the commit SHA a branch points at, or None if it does not exist.
+
+    Args:
+        github: Client to use
+        repo_name: Name of the repository
+        branch: Name of the branch
+
+    Returns:
+        Optional[str]: The branch's head commit SHA
+    """
+    try:
+        return github.get_branch(repo_name, branch)["commit"]["sha"]
+    except requests.exceptions.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
+        return None
+
+
+def _read_file_or_none(github: GitHubClient, repo: dict, path: str, ref: str) -> Optional[str]:
+    """Read a text file from a repository, or return None if it does not exist.
+
+    Args:
+        github: Client to use
+        repo: Repository data
+        path: Path of the file
+        ref: Branch, tag or commit to read from
+
+    Returns:
+        Optional[str]: The file contents
+    """
+    try:
+        return github.read_file(repo, path, ref)
+    except requests.exceptions.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
+        return None
+
+
+def _grant_team_admin(github: GitHubClient, repo_name: str, team_name: str) -> None:
+    """Grant a team admin access to a repository, logging rather than raising on API errors.
+
+    Args:
+        github: Client to use
+        repo_name: Name of the repository
+        team_name: Slug of the team to grant access
+    """
+    try:
+        github.set_team_permission(repo_name, team_name, "admin")
+    except requests.exceptions.HTTPError as perm_error:
+        logger.warning("Failed to set team permission: %s", perm_error)
+
+
+def _initialize_and_copy_template(github: GitHubClient, repo: dict, template_repo: dict) -> Tuple[str, str]:
+    """Make sure a repository has a default branch and copy the template's files onto it.
+
+    Used when the repository could not be generated from the template directly.
+
+    Args:
+        github: Client to use
+        repo: Repository data for the target repository
+        template_repo: Template repository info from GitHubClient.get_repository_info
+
+    Returns:
+        Tuple[str, str]: The target repository's default branch and the
+        commit SHA it points at
+    """
+    repo_name = repo["name"]
+
+    # Ensure the repository has a default branch by creating a README if needed
+    default_branch = repo.get("default_branch", "main")
+    try:
+        head_sha = github.get_branch(repo_name, default_branch)["commit"]["sha"]
+        logger.info("Repository has default branch: %s", default_branch)
+    except requests.exceptions.HTTPError:
+        # No default branch found, create a README to initialize the repository
+        logger.info("No default branch found, initializing repository with README.md")
+        # The contents API only returns once the commit is on the branch, so
+        # there is no need to poll the repository again afterwards
+        readme = github.create_readme_file(repo_name, branch=default_branch)
+        head_sha = readme["commit"]["sha"]
+        logger.info("Repository initialized with default branch %s at %s", default_branch, head_sha)
+
+    # Clone all files from template repository to the new repository. The
+    # template's default branch head is already known from the GraphQL
+    # lookup, so the clone does not need to resolve it again
+    template_repo_name = template_repo["name"]
+    logger.info("Copying all files from template repository %s to %s", template_repo_name, repo_name)
+    try:
+        head_sha = github.clone_repository_contents(
+            source_repo_name=template_repo_name,
+            target_repo_name=repo_name,
+            source_branch=template_repo["default_branch"] or "main",
+            target_branch=default_branch,
+            commit_message="Initial setup from template repository",
+            source_sha=template_repo["head_oid"]
+        )
+        logger.info("Successfully copied all files from %s to %s", template_repo_name, repo_name)
+    except Exception as e:
+        logger.error("Error copying files from template: %s", e)
+        logger.info("Continuing with repository setup even though template copying failed")
+
+    return default_branch, head_sha
+
+
+def get_request_key(template_input: TemplateInput) -> str:
+    """Build the idempotency key for a validated request.
+
+    Args:
+        template_input: Validated handler input
+
+    Returns:
+        str: Project name plus a hash of the full request
+    """
+    payload = json.dumps(template_input.model_dump(), sort_keys=True, default=str)
+    return f"{template_input.project_name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+@functools.lru_cache(maxsize=1)
+def get_template_manager() -> TemplateManager:
+    """Create the TemplateManager once per container.
+
+    Building it sets up the Jinja environment and loader; the PR title and
+    body templates compiled on one invocation stay cached on the manager
+    for the next.
+
+    Returns:
+        TemplateManager: Manager for the configured template repository
+    """
+    return TemplateManager(template_repo_name=TEMPLATE_REPO_NAME)
+
+
+@functools.lru_cache(maxsize=1)
+def get_static_github_config() -> GitHubConfig:
+    """Build the GitHub configuration once per container.
+
+    The environment does not change between warm invocations, so the
+    configuration (including the normalized base URL) is cached. The token
+    is left empty; callers fill it in with
+    ``model_copy(update={"token": ...})``.
+
+    Returns:
+        GitHubConfig: Configuration without a token
+    """
+    return GitHubConfig(
+        api_base_url=get_github_base_url(GITHUB_API),
+        org_name=GITHUB_ORG_NAME,
+        commit_author_name=COMMIT_AUTHOR_NAME,
+        commit_author_email=COMMIT_AUTHOR_EMAIL,
+        token="",
+        template_repo_name=TEMPLATE_REPO_NAME,
+        config_file_name=DEFAULT_CONFIG_FILE,
+        source_version=TEMPLATE_SOURCE_VERSION,
+    )
+
+
+def _get_secrets_client():
+    """Create the Secrets Manager client on first use and reuse it afterwards"""
+    global _SM_CLIENT
+    if _SM_CLIENT is None:
+        # boto3 is imported here rather than at module load, since it is only
+        # needed when the token has to be fetched from Secrets Manager
+        import boto3
+        from botocore.config import Config
+
+        # Configure boto3 to skip SSL verification if needed
+        session = boto3.session.Session()
+        client_kwargs = {"config": Config(**BOTO_CLIENT_CONFIG)}
+
+        if not VERIFY_SSL:
+            client_kwargs['verify'] = False
+
+        _SM_CLIENT = session.client('secretsmanager', **client_kwargs)
+    return _SM_CLIENT
+
+
+def _fetch_token_from_extension() -> Optional[str]:
+    """Read the token through the Parameters and Secrets Lambda Extension.
+
+    Returns:
+        The token, or None if the extension is not configured or unavailable
+    """
+    if not SECRETS_EXTENSION_PORT:
+        return None
+    try:
+        response = requests.get(
+            f"http://localhost:{SECRETS_EXTENSION_PORT}/secretsmanager/get",
+            params={"secretId": GITHUB_TOKEN_SECRET_NAME},
+            headers={"X-Aws-Parameters-Secrets-Token": os.environ.get("AWS_SESSION_TOKEN", "")},
+            timeout=2
+        )
+        response.raise_for_status()
+        return response.json()["SecretString"]
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+        logger.warning("Secrets extension unavailable, falling back to Secrets Manager: %s", e)
+        return None
+
+
+def _fetch_github_token() -> str:
+    """Fetch the token and store it in the cache.
+
+    The Parameters and Secrets Lambda Extension is used when configured, since
+    it answers from its own cache over localhost; otherwise the token comes
+    straight from Secrets Manager.
+    """
+    token = _fetch_token_from_extension()
+    if token is None:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = _get_secrets_client().get_secret_value(SecretId=GITHUB_TOKEN_SECRET_NAME)
+        except ClientError as e:
+            logger.error("Failed to get GitHub token: %s", e)
+            raise
+        token = response['SecretString']
+    _TOKEN_CACHE["value"] = token
+    _TOKEN_CACHE["expires_at"] = time.monotonic() + TOKEN_CACHE_TTL_SECONDS
+    return token
+
+
+def _refresh_github_token() -> None:
+    """Background refresh of a stale token; the caller holds the refresh lock"""
+    try:
+        _fetch_github_token()
+    except Exception as e:
+        # Keep serving the cached token; the next call will try again
+        logger.warning("Background GitHub token refresh failed: %s", e)
+    finally:
+        _TOKEN_CACHE["lock"].release()
+
+
 def get_github_token() -> str:
     """Get GitHub token from AWS Secrets Manager.
+
+    The token and the Secrets Manager client are cached at module level, so
+    warm invocations skip the round-trip while the token is younger than
+    TOKEN_CACHE_TTL_SECONDS. A stale token is still served for up to
+    TOKEN_STALE_GRACE_SECONDS more while a single background thread refreshes
+    it; past that the token is fetched synchronously.
     
     Returns:
         str: GitHub API token
@@ -247,23 +608,49 @@ def get_github_token() -> str:
     Raises:
         ClientError: If secret retrieval fails
     """
-    try:
-        # Configure boto3 to skip SSL verification if needed
-        session = boto3.session.Session()
-        client_kwargs = {}
-        
-        if not VERIFY_SSL:
-            client_kwargs['verify'] = False
-            # Suppress boto3 warning messages about insecure connections
-            import urllib3
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        client = session.client('secretsmanager', **client_kwargs)
-        response = client.get_secret_value(SecretId=GITHUB_TOKEN_SECRET_NAME)
-        return response['SecretString']
-    except ClientError as e:
-        logger.error(f"Failed to get GitHub token: {str(e)}")
-        raise
+    token = _TOKEN_CACHE["value"]
+    expires_at = _TOKEN_CACHE["expires_at"]
+    now = time.monotonic()
+
+    if token and now < expires_at:
+        return token
+
+    if token and now < expires_at + TOKEN_STALE_GRACE_SECONDS:
+        # Only one refresh in flight; everyone else keeps the cached token
+        if _TOKEN_CACHE["lock"].acquire(blocking=False):
+            threading.Thread(target=_refresh_github_token, daemon=True).start()
+        return token
+
+    return _fetch_github_token()
+
+
+def get_github_client(github_config: GitHubConfig) -> GitHubClient:
+    """Get a GitHubClient for the given configuration, reusing a cached one.
+
+    Clients are keyed on organization and token, so a warm container keeps
+    its HTTP session (and pooled connections) until the token rotates.
+
+    Args:
+        github_config: GitHub configuration including the token
+
+    Returns:
+        GitHubClient: Client for the configured organization
+    """
+    key = (github_config.org_name, github_config.token)
+    github = _GITHUB_CLIENTS.get(key)
+    if github is None:
+        # Drop clients built with a previous token
+        _GITHUB_CLIENTS.clear()
+        github = GitHubClient(
+            api_base_url=github_config.api_base_url,
+            token=github_config.token,
+            org_name=github_config.org_name,
+            commit_author_name=github_config.commit_author_name,
+            commit_author_email=github_config.commit_author_email,
+            verify_ssl=VERIFY_SSL  # Pass SSL verification setting
+        )
+        _GITHUB_CLIENTS[key] = github
+    return github
 
 
 def get_github_base_url(api_url: str) -> str:
@@ -275,14 +662,9 @@ def get_github_base_url(api_url: str) -> str:
     Returns:
         Normalized base URL for GitHub API
     """
-    # Remove trailing slashes and /api/v3 if present
-    base_url = api_url.rstrip('/')
-    if base_url.endswith('/api/v3'):
-        base_url = base_url[:-7]
-    elif '/api/v3' in base_url:
-        # In some GitHub Enterprise setups, the URL might be like https://github.e.it.census.gov/api/v3
-        # Extract just the server part
-        base_url = base_url.split('/api/v3')[0]
-    
-    logger.info(f"Using GitHub base URL: {base_url}")
+    # Remove trailing slashes and /api/v3 (plus anything after it) if present.
+    # In some GitHub Enterprise setups, the URL might be like https://github.e.it.census.gov/api/v3
+    base_url = _API_V3_RE.sub('', api_url.rstrip('/'), count=1)
+
+    logger.info("Using GitHub base URL: %s", base_url)
     return base_url
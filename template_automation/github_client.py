@@ -7,14 +7,103 @@ for template repository automation using the requests library directly.
 import base64
 import json
 import logging
+import threading
 import time
 import urllib.parse
-from typing import List, Optional, Dict, Any, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Connection pool size per host; the handler and the clone fan-out share it
+POOL_SIZE = 20
+
+# Blobs fetched per GraphQL query when copying template contents
+BLOB_QUERY_BATCH = 50
+# Parallel blob copies for files that cannot be inlined as text
+BLOB_COPY_WORKERS = 8
+# Files per tree request when copying contents; each request builds on the last
+TREE_CHUNK_SIZE = 200
+
+# Seconds to wait for the default branch of a newly initialized repository
+INIT_BRANCH_TIMEOUT = 2.0
+
+# Cap on in-flight requests per client, well under GitHub's secondary rate limit
+MAX_CONCURRENT_REQUESTS = 10
+# Retries for rate limit rejections, the longest we wait on one, and the total
+# time a client may spend waiting on them before reset_rate_limit_budget()
+RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_WAIT = 30.0
+RATE_LIMIT_WAIT_BUDGET = 60.0
+
+# ETag -> body cache for conditional GETs, shared by all clients in the
+# container and their worker threads. A 304 does not count against the
+# primary rate limit
+ETAG_CACHE_SIZE = 128
+_etag_cache: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+_etag_cache_lock = threading.Lock()
+
+# Template file listings by (org, repo, commit SHA). A commit's tree never
+# changes, so warm containers can reuse the listing without revalidating it.
+# Guarded like _etag_cache, since clones run alongside the handler's threads
+TEMPLATE_TREE_CACHE_SIZE = 16
+_template_tree_cache: "OrderedDict[Tuple[str, str, str], List[Dict[str, Any]]]" = OrderedDict()
+_template_tree_cache_lock = threading.Lock()
+
+REPOSITORY_INFO_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    name
+    url
+    defaultBranchRef {
+      name
+      target { oid }
+    }
+  }
+}
+"""
+
+CREATE_COMMIT_ON_BRANCH_MUTATION = """
+mutation($input: CreateCommitOnBranchInput!) {
+  createCommitOnBranch(input: $input) {
+    commit { oid url }
+  }
+}
+"""
+
+def _header_number(response: requests.Response, name: str) -> Optional[float]:
+    """Return a numeric response header, or None if it is missing or not a number."""
+    try:
+        return float(response.headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _is_secondary_rate_limit(response: requests.Response) -> bool:
+    """Return True if the response is a secondary rate limit rejection."""
+    return response.status_code in (403, 429) and (
+        "Retry-After" in response.headers or "secondary rate limit" in response.text.lower()
+    )
+
+def _is_primary_rate_limit(response: requests.Response) -> bool:
+    """Return True if the response was rejected because the primary rate limit is exhausted."""
+    return response.status_code in (403, 429) and _header_number(response, "X-RateLimit-Remaining") == 0
+
+# Aliased Blob lookups are filled into {fields} with str.format, so the
+# query's own braces are doubled like BLOB_TEXT_FIELD's
+BLOB_TEXTS_QUERY = """
+query($owner: String!, $name: String!) {{
+  repository(owner: $owner, name: $name) {{
+{fields}
+  }}
+}}
+"""
+BLOB_TEXT_FIELD = '{alias}: object(oid: "{oid}") {{ ... on Blob {{ text isBinary isTruncated }} }}'
+
 class GitHubClient:
     """A client for interacting with GitHub's API in the context of template automation.
     
@@ -76,8 +165,24 @@ class GitHubClient:
         self.commit_author_email = commit_author_email
         self.verify_ssl = verify_ssl
         
-        # Create session for connection reuse
+        # Create session for connection reuse. Only idempotent requests are
+        # retried on gateway errors, which urllib3's Retry does by default
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                              raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limit_budget = RATE_LIMIT_WAIT_BUDGET
+
+        # Lookups that do not change during a client's lifetime
+        self._repo_cache: Dict[str, Dict[str, Any]] = {}
+        self._team_cache: Dict[str, Dict[str, Any]] = {}
         self.session.headers.update({
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json',
@@ -85,14 +190,16 @@ class GitHubClient:
         })
         
         # Log initialization
-        logger.info(f"Initialized GitHub client for org: {org_name} (SSL verify: {verify_ssl})")
+        logger.info("Initialized GitHub client for org: %s (SSL verify: %s)", org_name, verify_ssl)
 
-    def _request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+    def _request(self, method: str, url: str, conditional: bool = False, **kwargs) -> Dict[str, Any]:
         """Make a request to the GitHub API.
         
         Args:
             method: HTTP method (GET, POST, PATCH, PUT, DELETE)
             url: URL path or full URL to request
+            conditional: For GETs, send If-None-Match with a cached ETag and
+                reuse the cached body on 304 Not Modified
             **kwargs: Additional arguments to pass to requests
             
         Returns:
@@ -108,28 +215,53 @@ class GitHubClient:
         # Set SSL verification
         kwargs['verify'] = self.verify_ssl
         
-        # Log the request
+        # Serialize JSON payloads once and reuse the encoded body for logging
         if 'json' in kwargs:
-            logger.info(f"GitHub API {method} request to {url} with payload: {json.dumps(kwargs['json'])}")
-        else:
-            logger.info(f"GitHub API {method} request to {url}")
+            body = json.dumps(kwargs.pop('json'))
+            kwargs['data'] = body.encode('utf-8')
+            kwargs['headers'] = {'Content-Type': 'application/json', **(kwargs.get('headers') or {})}
+            logger.debug("GitHub API %s request to %s with payload: %s", method, url, body)
+        logger.info("GitHub API %s request to %s", method, url)
+
+        cached = None
+        if conditional:
+            cache_key = f"{url}?{urllib.parse.urlencode(kwargs.get('params') or {})}"
+            with _etag_cache_lock:
+                cached = _etag_cache.get(cache_key)
+            if cached:
+                kwargs['headers'] = {'If-None-Match': cached[0], **(kwargs.get('headers') or {})}
         
         # Make the request
         try:
-            response = self.session.request(method, url, **kwargs)
+            response = self._send(method, url, **kwargs)
+
+            if cached and response.status_code == 304:
+                logger.info("Not modified, using cached response for %s", url)
+                with _etag_cache_lock:
+                    if cache_key in _etag_cache:
+                        _etag_cache.move_to_end(cache_key)
+                return dict(cached[1])
             
             # Raise exception for error status codes
             if response.status_code >= 400:
-                logger.error(f"GitHub API error: {response.status_code} - {response.text}")
+                logger.error("GitHub API error: %s - %s", response.status_code, response.text)
                 
             response.raise_for_status()
             
             # Return JSON data for non-empty responses
             if response.text:
                 try:
-                    return response.json()
+                    data = response.json()
+                    etag = response.headers.get('ETag')
+                    if conditional and etag:
+                        with _etag_cache_lock:
+                            _etag_cache[cache_key] = (etag, data)
+                            _etag_cache.move_to_end(cache_key)
+                            if len(_etag_cache) > ETAG_CACHE_SIZE:
+                                _etag_cache.popitem(last=False)
+                    return data
                 except json.JSONDecodeError:
-                    logger.warning(f"Received non-JSON response: {response.text}")
+                    logger.warning("Received non-JSON response: %s", response.text)
                     return {"raw_content": response.text}
             return {}
         except requests.exceptions.RequestException as e:
@@ -139,15 +271,159 @@ class GitHubClient:
                     if e.response.text.strip():
                         try:
                             error_body = e.response.json()
-                            logger.error(f"GitHub API error details: {json.dumps(error_body)}")
+                            logger.error("GitHub API error details: %s", json.dumps(error_body))
                         except json.JSONDecodeError:
-                            logger.error(f"GitHub API returned non-JSON error: {e.response.text}")
+                            logger.error("GitHub API returned non-JSON error: %s", e.response.text)
                     else:
-                        logger.error(f"GitHub API returned empty error response with status code: {e.response.status_code}")
+                        logger.error("GitHub API returned empty error response with status code: %s", e.response.status_code)
                 except (ValueError, AttributeError):
-                    logger.error(f"GitHub API error: Unable to parse response")
-            logger.error(f"Request failed: {str(e)}")
+                    logger.error("GitHub API error: Unable to parse response")
+            logger.error("Request failed: %s", e)
+            raise
+
+    def reset_rate_limit_budget(self) -> None:
+        """Restore the total time this client may spend waiting on rate limits.
+
+        Clients are reused across warm invocations, so the handler calls this
+        at the start of each one.
+        """
+        with self._rate_limit_lock:
+            self._rate_limit_budget = RATE_LIMIT_WAIT_BUDGET
+
+    def _reserve_rate_limit_wait(self, delay: float) -> bool:
+        """Take delay seconds from the wait budget, if it is within both limits."""
+        with self._rate_limit_lock:
+            if delay > MAX_RATE_LIMIT_WAIT or delay > self._rate_limit_budget:
+                return False
+            self._rate_limit_budget -= delay
+            return True
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, bounded in concurrency and backing off on rate limits.
+        
+        Rate limit rejections (403/429 that are secondary limits, or with no
+        primary requests remaining) are retried. Secondary limits wait for
+        Retry-After (capped at MAX_RATE_LIMIT_WAIT) or back off exponentially;
+        an exhausted primary limit waits until X-RateLimit-Reset. A wait longer
+        than MAX_RATE_LIMIT_WAIT, or than what is left of the client's
+        RATE_LIMIT_WAIT_BUDGET, is not taken and the rejection is returned as is.
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            with self._request_slots:
+                response = self.session.request(method, url, **kwargs)
+
+            if attempt == RATE_LIMIT_RETRIES:
+                break
+            if _is_secondary_rate_limit(response):
+                delay = _header_number(response, "Retry-After")
+                if delay is not None:
+                    delay = min(delay, MAX_RATE_LIMIT_WAIT)
+            elif _is_primary_rate_limit(response):
+                reset = _header_number(response, "X-RateLimit-Reset")
+                delay = max(reset - time.time(), 0.0) if reset is not None else None
+            else:
+                break
+            if delay is None:
+                delay = 2 ** attempt
+
+            if not self._reserve_rate_limit_wait(delay):
+                logger.warning("Rate limit for %s resets in %.1fs, beyond the wait budget; not retrying", url, delay)
+                break
+            logger.warning("Rate limit hit for %s, retrying in %.1fs", url, delay)
+            time.sleep(delay)
+        return response
+
+    def graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a GraphQL query or mutation against the GitHub API.
+        
+        Args:
+            query: GraphQL document
+            variables: Variables referenced by the document
+            
+        Returns:
+            The "data" member of the response
+            
+        Raises:
+            ValueError: If the response contains GraphQL errors
+        """
+        result = self._request("POST", "/api/graphql", json={
+            "query": query,
+            "variables": variables or {}
+        })
+        if result.get("errors"):
+            messages = "; ".join(error.get("message", str(error)) for error in result["errors"])
+            raise ValueError(f"GitHub GraphQL error: {messages}")
+        return result.get("data") or {}
+
+    def get_repository_info(self, repo_name: str) -> Optional[Dict[str, Any]]:
+        """Look up a repository's default branch and head commit in one request.
+        
+        Args:
+            repo_name: Name of the repository
+            
+        Returns:
+            Dict with name, url, default_branch and head_oid, or None if the
+            repository does not exist
+        """
+        try:
+            data = self.graphql(REPOSITORY_INFO_QUERY, {"owner": self.org_name, "name": repo_name})
+        except ValueError as e:
+            # GitHub reports a missing repository as a NOT_FOUND error
+            if "Could not resolve to a Repository" in str(e):
+                return None
             raise
+        repository = data.get("repository")
+        if repository is None:
+            return None
+
+        branch_ref = repository.get("defaultBranchRef") or {}
+        return {
+            "name": repository["name"],
+            "html_url": repository["url"],
+            "default_branch": branch_ref.get("name"),
+            "head_oid": (branch_ref.get("target") or {}).get("oid")
+        }
+
+    def create_commit_on_branch(
+        self,
+        repo_name: str,
+        branch: str,
+        files: Dict[str, str],
+        commit_message: str,
+        expected_head_oid: str
+    ) -> Dict[str, Any]:
+        """Add or update files on a branch in a single commit using GraphQL.
+        
+        Unlike write_file, this needs no lookup of the existing file first.
+        
+        Args:
+            repo_name: Name of the repository
+            branch: Branch to commit to
+            files: Mapping of file path to text content
+            commit_message: Commit headline
+            expected_head_oid: Commit the branch is expected to point at
+            
+        Returns:
+            The created commit's oid and url
+        """
+        additions = [
+            {"path": path, "contents": base64.b64encode(content.encode("utf-8")).decode("ascii")}
+            for path, content in files.items()
+        ]
+        data = self.graphql(CREATE_COMMIT_ON_BRANCH_MUTATION, {
+            "input": {
+                "branch": {
+                    "repositoryNameWithOwner": f"{self.org_name}/{repo_name}",
+                    "branchName": branch
+                },
+                "message": {"headline": commit_message},
+                "fileChanges": {"additions": additions},
+                "expectedHeadOid": expected_head_oid
+            }
+        })
+        commit = data["createCommitOnBranch"]["commit"]
+        logger.info("Committed %s files to %s:%s as %s", len(additions), repo_name, branch, commit["oid"])
+        return commit
 
     def get_repository(
         self,
@@ -165,11 +441,11 @@ class GitHubClient:
         Returns:
             The repository data
         """
+        repo_url = f"/api/v3/repos/{self.org_name}/{repo_name}"
         try:
             # Try to get the repository
-            url = f"/api/v3/repos/{self.org_name}/{repo_name}"
-            repo = self._request("GET", url)
-            logger.info(f"Found existing repository: {repo_name}")
+            repo = self._request("GET", repo_url, conditional=True)
+            logger.info("Found existing repository: %s", repo_name)
             
             if owning_team:
                 self.set_team_permission(repo_name, owning_team, "admin")
@@ -177,7 +453,7 @@ class GitHubClient:
             return repo
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404 and create:
-                logger.info(f"Creating repository {repo_name}")
+                logger.info("Creating repository %s", repo_name)
                 
                 # Create a new repository with minimal parameters
                 url = f"/api/v3/orgs/{self.org_name}/repos"
@@ -190,7 +466,7 @@ class GitHubClient:
                 except requests.exceptions.HTTPError as create_error:
                     # Safe handling of response parsing
                     error_message = str(create_error)
-                    logger.error(f"Failed to create repository with error: {error_message}")
+                    logger.error("Failed to create repository with error: %s", error_message)
                     
                     # If we got an HTML response instead of JSON (likely an error page)
                     if "<!DOCTYPE html>" in error_message or "<html" in error_message:
@@ -201,12 +477,12 @@ class GitHubClient:
                 
                 # Now explicitly initialize the repository with a README.md file
                 try:
-                    logger.info(f"Initializing repository {repo_name} with a README.md file")
+                    logger.info("Initializing repository %s with a README.md file", repo_name)
                     readme_content = f"# {repo_name}\n\nThis repository was created by the template automation system."
                     content_bytes = readme_content.encode("utf-8")
                     content_base64 = base64.b64encode(content_bytes).decode("utf-8")
                     
-                    readme_url = f"/api/v3/repos/{self.org_name}/{repo_name}/contents/README.md"
+                    readme_url = f"{repo_url}/contents/README.md"
                     readme_result = self._request("PUT", readme_url, json={
                         "message": "Initial commit with README",
                         "content": content_base64,
@@ -215,35 +491,26 @@ class GitHubClient:
                             "email": self.commit_author_email
                         }
                     })
-                    logger.info(f"Successfully created README.md in {repo_name}")
-                    
-                    # Give GitHub time to process the commit and create the branch
-                    time.sleep(2)
+                    logger.info("Successfully created README.md in %s", repo_name)
                     
-                    # Now get the updated repository info
-                    repo = self._request("GET", url.replace("/orgs/", "/repos/"))
-                    
-                    # Verify we have a default branch
-                    for _ in range(3):  # Try up to 3 times
-                        try:
-                            default_branch = repo.get("default_branch", "main")
-                            branch_info = self.get_branch(repo_name, default_branch)
-                            logger.info(f"Confirmed default branch '{default_branch}' exists")
-                            break
-                        except requests.exceptions.HTTPError:
-                            logger.info("Default branch not ready yet, waiting...")
-                            time.sleep(2)
-                            repo = self._request("GET", url.replace("/orgs/", "/repos/"))
+                    # The contents API only returns once the commit is on the
+                    # default branch, so one branch check normally suffices;
+                    # the short timeout only covers a lagging replica
+                    repo = self._request("GET", repo_url)
+                    default_branch = repo.get("default_branch", "main")
+                    self.wait_for_branch(repo_name, default_branch, timeout=INIT_BRANCH_TIMEOUT)
+                    logger.info("Initialized default branch '%s' at %s",
+                                default_branch, readme_result["commit"]["sha"])
                     
                 except Exception as init_error:
-                    logger.error(f"Failed to initialize repository: {str(init_error)}")
+                    logger.error("Failed to initialize repository: %s", init_error)
                     # Continue anyway since we already have the repository
                 
                 if owning_team:
                     try:
                         self.set_team_permission(repo_name, owning_team, "admin")
                     except requests.exceptions.HTTPError as perm_error:
-                        logger.warning(f"Failed to set team permission: {str(perm_error)}")
+                        logger.warning("Failed to set team permission: %s", perm_error)
                     
                 return repo
             raise
@@ -259,7 +526,37 @@ class GitHubClient:
             Branch data
         """
         url = f"/api/v3/repos/{self.org_name}/{repo_name}/branches/{branch_name}"
-        return self._request("GET", url)
+        return self._request("GET", url, conditional=True)
+
+    def wait_for_branch(self, repo_name: str, branch_name: str, timeout: float = 10.0) -> Dict[str, Any]:
+        """Poll with exponential backoff until a branch exists.
+        
+        Args:
+            repo_name: Name of the repository
+            branch_name: Name of the branch to wait for
+            timeout: Seconds to keep polling before giving up
+            
+        Returns:
+            Branch data once the branch is available
+            
+        Raises:
+            ValueError: If the branch does not appear before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.1
+        while True:
+            try:
+                return self.get_branch(repo_name, branch_name)
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                logger.debug("Branch %s of %s not ready yet", branch_name, repo_name)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ValueError(f"Branch {branch_name} did not become available in repository {repo_name}")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 2.0)
 
     def get_default_branch(self, repo_name: str) -> str:
         """Get the default branch name of a repository.
@@ -273,17 +570,30 @@ class GitHubClient:
         repo = self.get_repository(repo_name)
         return repo["default_branch"]
 
-    def create_branch(self, repo_name: str, branch_name: str, from_ref: str = "main") -> None:
+    def create_branch(
+        self,
+        repo_name: str,
+        branch_name: str,
+        from_ref: str = "main",
+        from_sha: Optional[str] = None
+    ) -> str:
         """Create a new branch in the repository.
         
         Args:
             repo_name: Name of the repository
             branch_name: Name of the branch to create
             from_ref: Reference to create branch from
+            from_sha: Commit SHA of from_ref, if the caller already knows it;
+                skips looking the branch up
+
+        Returns:
+            SHA of the commit the new branch points at
         """
-        # Get the SHA of the source branch
-        source_branch = self.get_branch(repo_name, from_ref)
-        commit_sha = source_branch["commit"]["sha"]
+        commit_sha = from_sha
+        if commit_sha is None:
+            # Get the SHA of the source branch
+            source_branch = self.get_branch(repo_name, from_ref)
+            commit_sha = source_branch["commit"]["sha"]
         
         # Create the new branch
         url = f"/api/v3/repos/{self.org_name}/{repo_name}/git/refs"
@@ -292,7 +602,8 @@ class GitHubClient:
             "sha": commit_sha
         })
         
-        logger.info(f"Created branch {branch_name} in {repo_name}")
+        logger.info("Created branch %s in %s", branch_name, repo_name)
+        return commit_sha
 
     def create_reference(self, repo_name: str, ref: str, sha: str) -> None:
         """Create a Git reference.
@@ -308,7 +619,7 @@ class GitHubClient:
             "sha": sha
         })
         
-        logger.info(f"Created reference {ref} in {repo_name}")
+        logger.info("Created reference %s in %s", ref, repo_name)
 
     def update_reference(self, repo_name: str, ref: str, sha: str, force: bool = False) -> None:
         """Update a Git reference.
@@ -325,7 +636,7 @@ class GitHubClient:
             "force": force
         })
         
-        logger.info(f"Updated reference {ref} in {repo_name}")
+        logger.info("Updated reference %s in %s", ref, repo_name)
 
     def write_file(
         self,
@@ -366,7 +677,7 @@ class GitHubClient:
                     "email": self.commit_author_email
                 }
             })
-            logger.info(f"Updated file {path} in repo {repo_name}")
+            logger.info("Updated file %s in repo %s", path, repo_name)
             return result["content"]
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -381,7 +692,7 @@ class GitHubClient:
                         "email": self.commit_author_email
                     }
                 })
-                logger.info(f"Created new file {path} in repo {repo_name}")
+                logger.info("Created new file %s in repo %s", path, repo_name)
                 return result["content"]
             raise
 
@@ -398,7 +709,7 @@ class GitHubClient:
         """
         url = f"/api/v3/repos/{self.org_name}/{repo_name}/contents/{path}"
         params = {"ref": ref}
-        return self._request("GET", url, params=params)
+        return self._request("GET", url, conditional=True, params=params)
 
     def read_file(self, repo: Dict[str, Any], path: str, ref: str = "main") -> str:
         """Read a file from a repository.
@@ -445,33 +756,63 @@ class GitHubClient:
             "maintainer_can_modify": True
         })
         
-        logger.info(f"Created PR #{pr['number']} in {repo_name}: {title}")
+        logger.info("Created PR #%s in %s: %s", pr['number'], repo_name, title)
         return pr
 
+    def find_pull_request(self, repo_name: str, head_branch: str, base_branch: str = "main") -> Optional[Dict[str, Any]]:
+        """Find an open pull request from one branch of the repository into another.
+        
+        Args:
+            repo_name: Name of the repository
+            head_branch: Branch containing the changes
+            base_branch: Branch the pull request merges into
+            
+        Returns:
+            The first matching open pull request, or None
+        """
+        url = f"/api/v3/repos/{self.org_name}/{repo_name}/pulls"
+        pulls = self._request("GET", url, params={
+            "head": f"{self.org_name}:{head_branch}",
+            "base": base_branch,
+            "state": "open"
+        })
+        return pulls[0] if pulls else None
+
     def trigger_workflow(
         self,
         repo_name: str,
         workflow_id: str,
         ref: str,
-        inputs: Optional[Dict[str, Any]] = None
+        inputs: Optional[Dict[str, Any]] = None,
+        timeout: Tuple[float, float] = (1.0, 2.0)
     ) -> None:
         """Trigger a GitHub Actions workflow.
         
+        The dispatch is fire-and-forget: GitHub only answers with an empty 204,
+        so if the response does not arrive within the read timeout the request
+        is assumed to have been accepted and the call returns without blocking.
+        
         Args:
             repo_name: Name of the repository
             workflow_id: ID or filename of the workflow
             ref: Git reference to run the workflow on
             inputs: Input parameters for the workflow
+            timeout: (connect, read) timeout in seconds for the dispatch request
         """
         url = f"/api/v3/repos/{self.org_name}/{repo_name}/actions/workflows/{workflow_id}/dispatches"
         workflow_inputs = inputs if inputs is not None else {}
         
-        self._request("POST", url, json={
-            "ref": ref,
-            "inputs": workflow_inputs
-        })
+        try:
+            self._request("POST", url, json={
+                "ref": ref,
+                "inputs": workflow_inputs
+            }, timeout=timeout)
+        except requests.exceptions.ReadTimeout:
+            logger.warning("No response to workflow %s dispatch in %s within %ss, continuing without confirmation",
+                           workflow_id, repo_name, timeout[1])
+            return
         
-        logger.info(f"Triggered workflow {workflow_id} in {repo_name} on {ref}")
+        logger.info("Triggered workflow %s in %s on %s", workflow_id, repo_name, ref)
     
     def set_team_permission(self, repo_name: str, team_name: str, permission: str) -> None:
         """Set a team's permission on a repository.
@@ -481,11 +822,14 @@ class GitHubClient:
             team_name: Name of the team
             permission: Permission level ('pull', 'push', 'admin', 'maintain', 'triage')
         """
-        # First check if the team exists
+        # First check if the team exists; teams are looked up once per client
         try:
-            team_url = f"/api/v3/orgs/{self.org_name}/teams/{team_name}"
-            team = self._request("GET", team_url)
-            logger.info(f"Found team: {team_name}")
+            team = self._team_cache.get(team_name)
+            if team is None:
+                team_url = f"/api/v3/orgs/{self.org_name}/teams/{team_name}"
+                team = self._request("GET", team_url)
+                self._team_cache[team_name] = team
+            logger.info("Found team: %s", team_name)
             
             # Try to set permissions using the correct endpoint
             # Different GitHub Enterprise versions might support different API paths
@@ -493,40 +837,52 @@ class GitHubClient:
                 # First try the standard endpoint
                 url = f"/api/v3/orgs/{self.org_name}/teams/{team_name}/repos/{self.org_name}/{repo_name}"
                 self._request("PUT", url, json={"permission": permission})
-                logger.info(f"Set {team_name} permission on {repo_name} to {permission}")
+                logger.info("Set %s permission on %s to %s", team_name, repo_name, permission)
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 422 or e.response.status_code == 404:
                     # Try alternative endpoint format for older GitHub Enterprise versions
                     try:
                         alt_url = f"/api/v3/teams/{team['id']}/repos/{self.org_name}/{repo_name}"
                         self._request("PUT", alt_url, json={"permission": permission})
-                        logger.info(f"Set {team_name} permission on {repo_name} to {permission} using alternative endpoint")
+                        logger.info("Set %s permission on %s to %s using alternative endpoint", team_name, repo_name, permission)
                     except requests.exceptions.HTTPError as alt_e:
-                        logger.error(f"Failed to set team permission using alternative endpoint: {str(alt_e)}")
+                        logger.error("Failed to set team permission using alternative endpoint: %s", alt_e)
                         raise
                 else:
                     raise
         except requests.exceptions.HTTPError as e:
-            logger.error(f"Failed to find team {team_name}: {str(e)}")
+            logger.error("Failed to find team %s: %s", team_name, e)
             if e.response.status_code == 404:
-                logger.warning(f"Team {team_name} not found, skipping permission assignment")
+                logger.warning("Team %s not found, skipping permission assignment", team_name)
             else:
                 raise
 
-    def update_repository_topics(self, repo_name: str, topics: List[str]) -> None:
+    def update_repository_topics(
+        self,
+        repo_name: str,
+        topics: List[str],
+        current_topics: Optional[List[str]] = None
+    ) -> None:
         """Update the topics of a repository.
         
         Args:
             repo_name: Name of the repository
             topics: List of topics to set
+            current_topics: Topics the repository is known to have (e.g. the
+                "topics" field of its repository data); the update is skipped
+                when they already match
         """
+        if current_topics is not None and set(current_topics) == set(topics):
+            logger.info("Topics for %s already up to date", repo_name)
+            return
+
         # GitHub API requires a special media type for repository topics
         headers = {"Accept": "application/vnd.github.mercy-preview+json"}
         url = f"/api/v3/repos/{self.org_name}/{repo_name}/topics"
         
         self._request("PUT", url, json={"names": topics}, headers=headers)
         
-        logger.info(f"Updated topics for {repo_name}: {topics}")
+        logger.info("Updated topics for %s: %s", repo_name, topics)
 
     def create_repository_from_template(
         self,
@@ -550,29 +906,32 @@ class GitHubClient:
         """
         url = f"/api/v3/repos/{self.org_name}/{template_repo_name}/generate"
         
-        # Create repository from template
+        # Create repository from template; older GitHub Enterprise releases still
+        # gate the endpoint behind the baptiste preview media type
         new_repo = self._request("POST", url, json={
             "name": new_repo_name,
             "owner": self.org_name,
             "description": description or f"Repository created from template: {template_repo_name}",
             "private": private
-        })
+        }, headers={"Accept": "application/vnd.github.baptiste-preview+json"})
         
         # Add topics if provided
         if topics:
             self.update_repository_topics(new_repo_name, topics)
             
-        logger.info(f"Created new repository: {new_repo_name} from template: {template_repo_name}")
+        logger.info("Created new repository: %s from template: %s", new_repo_name, template_repo_name)
         return new_repo
 
-    def create_readme_file(self, repo_name: str) -> Dict[str, Any]:
+    def create_readme_file(self, repo_name: str, branch: Optional[str] = None) -> Dict[str, Any]:
         """Create a README.md file in an empty repository to initialize it.
         
         Args:
             repo_name: Name of the repository
+            branch: Branch to create the file on; in an empty repository this
+                creates the branch. Defaults to the repository's default branch
             
         Returns:
-            The created file content data
+            The contents API response, with "content" and "commit" members
         """
         content = f"""# {repo_name}
 
@@ -582,17 +941,127 @@ This repository was created automatically by the template automation system.
         content_base64 = base64.b64encode(content_bytes).decode("utf-8")
         
         url = f"/api/v3/repos/{self.org_name}/{repo_name}/contents/README.md"
-        result = self._request("PUT", url, json={
+        payload = {
             "message": "Initialize repository with README",
             "content": content_base64,
             "committer": {
                 "name": self.commit_author_name,
                 "email": self.commit_author_email
             }
-        })
+        }
+        if branch:
+            payload["branch"] = branch
+        result = self._request("PUT", url, json=payload)
         
-        logger.info(f"Created README.md in repository {repo_name} to initialize it")
-        return result["content"]
+        logger.info("Created README.md in repository %s to initialize it", repo_name)
+        return result
+
+    def _fetch_blob_texts(self, repo_name: str, oids: List[str]) -> Dict[str, Optional[str]]:
+        """Fetch the text of many blobs with batched GraphQL queries.
+
+        Args:
+            repo_name: Name of the repository the blobs belong to
+            oids: Blob SHAs to fetch
+
+        Returns:
+            Mapping of blob SHA to its text, or None for binary or truncated blobs
+        """
+        texts: Dict[str, Optional[str]] = {}
+        unique_oids = list(dict.fromkeys(oids))
+        for start in range(0, len(unique_oids), BLOB_QUERY_BATCH):
+            batch = unique_oids[start:start + BLOB_QUERY_BATCH]
+            # Blob SHAs are hex strings, so they can be inlined as aliased fields
+            fields = "\n".join(
+                BLOB_TEXT_FIELD.format(alias=f"b{i}", oid=oid) for i, oid in enumerate(batch)
+            )
+            query = BLOB_TEXTS_QUERY.format(fields=fields)
+            data = self.graphql(query, {"owner": self.org_name, "name": repo_name})
+            repository = data.get("repository") or {}
+            for i, oid in enumerate(batch):
+                blob = repository.get(f"b{i}") or {}
+                readable = not blob.get("isBinary") and not blob.get("isTruncated")
+                texts[oid] = blob.get("text") if readable else None
+        return texts
+
+    def _copy_blob(self, source_repo_name: str, target_repo_name: str, blob_sha: str) -> Optional[str]:
+        """Copy a blob between repositories without decoding it.
+
+        Args:
+            source_repo_name: Repository to read the blob from
+            target_repo_name: Repository to create the blob in
+            blob_sha: SHA of the source blob
+
+        Returns:
+            SHA of the blob in the target repository, or None if the copy failed
+        """
+        try:
+            blob = self._request("GET", f"/api/v3/repos/{self.org_name}/{source_repo_name}/git/blobs/{blob_sha}")
+            created = self._request("POST", f"/api/v3/repos/{self.org_name}/{target_repo_name}/git/blobs", json={
+                # The API wraps base64 at 60 columns; git/blobs wants it unwrapped
+                "content": blob.get("content", "").replace("\n", ""),
+                "encoding": blob.get("encoding", "base64")
+            })
+        except requests.exceptions.RequestException as blob_err:
+            logger.error("Failed to copy blob %s: %s", blob_sha, blob_err)
+            # Continue with other files
+            return None
+        return created["sha"]
+
+    def _content_tree_entries(
+        self,
+        source_repo_name: str,
+        target_repo_name: str,
+        files: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Build tree entries that carry file contents into the target repository.
+
+        Text files are inlined; binary and oversized files are copied as blobs
+        and referenced by SHA.
+
+        Args:
+            source_repo_name: Repository the files come from
+            target_repo_name: Repository the tree will be created in
+            files: Blob entries from a recursive tree listing of the source
+
+        Returns:
+            Tree entries for every file that could be copied
+        """
+        # Fetch every file's text in a few batched GraphQL queries
+        # instead of one REST request per blob
+        texts = self._fetch_blob_texts(source_repo_name, [item["sha"] for item in files])
+        tree_entries = []
+        raw_files = []
+        for item in files:
+            text = texts.get(item["sha"])
+            if text is None:
+                raw_files.append(item)
+                continue
+            tree_entries.append({
+                "path": item["path"],
+                "mode": item["mode"],
+                "type": "blob",
+                "content": text
+            })
+
+        # Binary and oversized files cannot be inlined in the tree;
+        # copy them as base64 blobs in parallel and reference them by SHA
+        if raw_files:
+            logger.info("Copying %s binary or large files as blobs", len(raw_files))
+            with ThreadPoolExecutor(max_workers=BLOB_COPY_WORKERS) as executor:
+                blob_shas = executor.map(
+                    lambda item: self._copy_blob(source_repo_name, target_repo_name, item["sha"]),
+                    raw_files
+                )
+                for item, blob_sha in zip(raw_files, blob_shas):
+                    if blob_sha is None:
+                        continue
+                    tree_entries.append({
+                        "path": item["path"],
+                        "mode": item["mode"],
+                        "type": "blob",
+                        "sha": blob_sha
+                    })
+        return tree_entries
 
     def clone_repository_contents(
         self,
@@ -600,8 +1069,10 @@ This repository was created automatically by the template automation system.
         target_repo_name: str,
         source_branch: str = "main",
         target_branch: str = "main",
-        commit_message: str = "Initial repository setup from template"
-    ) -> None:
+        commit_message: str = "Initial repository setup from template",
+        source_sha: Optional[str] = None,
+        shares_objects: bool = False
+    ) -> str:
         """Clone all files from a source repository to a target repository.
         
         This method copies all files from the source repository to the target repository,
@@ -614,51 +1085,73 @@ This repository was created automatically by the template automation system.
             source_branch: Branch to copy files from in the source repository
             target_branch: Branch to copy files to in the target repository
             commit_message: Commit message for the file creation commit
+            source_sha: Commit SHA of source_branch, if the caller already
+                resolved it (e.g. with get_repository_info); skips looking up
+                the source repository and branch
+            shares_objects: Whether the target shares the source's object
+                store (e.g. it is in the same fork network), so the tree can
+                reference the source blobs by SHA instead of copying contents
+
+        Returns:
+            SHA of the commit the target branch now points at
             
         Raises:
             ValueError: If source repository or branch doesn't exist
         """
-        logger.info(f"Cloning contents from {source_repo_name}:{source_branch} to {target_repo_name}:{target_branch}")
+        logger.info("Cloning contents from %s:%s to %s:%s", source_repo_name, source_branch, target_repo_name, target_branch)
         
         try:
-            # Get the source repository info
-            source_repo = self.get_repository(source_repo_name)
+            # Confirm the source repository exists; template repositories are
+            # looked up once per client and reused by later clones
+            if source_sha is None and source_repo_name not in self._repo_cache:
+                self._repo_cache[source_repo_name] = self.get_repository(source_repo_name)
             
             # Get the branch reference from source
             try:
-                source_branch_info = self.get_branch(source_repo_name, source_branch)
-                source_commit_sha = source_branch_info["commit"]["sha"]
-                logger.info(f"Using source commit SHA: {source_commit_sha}")
-                
-                # Get the tree recursively to get all files
-                tree_url = f"/api/v3/repos/{self.org_name}/{source_repo_name}/git/trees/{source_commit_sha}?recursive=1"
-                tree_data = self._request("GET", tree_url)
+                source_commit_sha = source_sha
+                if source_commit_sha is None:
+                    source_branch_info = self.get_branch(source_repo_name, source_branch)
+                    source_commit_sha = source_branch_info["commit"]["sha"]
+                logger.info("Using source commit SHA: %s", source_commit_sha)
                 
-                # Filter out directories, only keep files
-                files = [item for item in tree_data.get("tree", []) if item["type"] == "blob"]
-                logger.info(f"Found {len(files)} files to copy from {source_repo_name}")
+                tree_key = (self.org_name, source_repo_name, source_commit_sha)
+                with _template_tree_cache_lock:
+                    files = _template_tree_cache.get(tree_key)
+                    if files is not None:
+                        _template_tree_cache.move_to_end(tree_key)
+                if files is None:
+                    # Get the tree recursively to get all files
+                    tree_url = f"/api/v3/repos/{self.org_name}/{source_repo_name}/git/trees/{source_commit_sha}?recursive=1"
+                    tree_data = self._request("GET", tree_url)
+
+                    # Keep only files, skipping the .git directory and other
+                    # metadata if the template somehow carries it
+                    files = [
+                        item for item in tree_data.get("tree", [])
+                        if item["type"] == "blob"
+                        and not (item["path"].startswith(".git/") or item["path"] == ".git")
+                    ]
+                    with _template_tree_cache_lock:
+                        _template_tree_cache[tree_key] = files
+                        _template_tree_cache.move_to_end(tree_key)
+                        if len(_template_tree_cache) > TEMPLATE_TREE_CACHE_SIZE:
+                            _template_tree_cache.popitem(last=False)
+                logger.info("Found %s files to copy from %s", len(files), source_repo_name)
                 
                 # First ensure the target repository has the target branch
                 try:
                     # Check if target branch exists
                     target_branch_data = self.get_branch(target_repo_name, target_branch)
                     target_latest_commit = target_branch_data["commit"]["sha"]
-                    logger.info(f"Target branch {target_branch} already exists in {target_repo_name} with commit {target_latest_commit}")
+                    logger.info("Target branch %s already exists in %s with commit %s", target_branch, target_repo_name, target_latest_commit)
                 except requests.exceptions.HTTPError as e:
                     if e.response.status_code == 404:
                         # Create README to initialize the repository with the target branch
-                        logger.info(f"Creating README.md to initialize {target_repo_name} with {target_branch} branch")
-                        self.create_readme_file(target_repo_name)
-                        # Wait for branch to be created
-                        time.sleep(2)
-                        # Verify branch was created
-                        try:
-                            target_branch_data = self.get_branch(target_repo_name, target_branch)
-                            target_latest_commit = target_branch_data["commit"]["sha"]
-                            logger.info(f"Successfully created branch {target_branch} in {target_repo_name} with commit {target_latest_commit}")
-                        except Exception as branch_err:
-                            logger.error(f"Failed to verify branch creation: {str(branch_err)}")
-                            raise ValueError(f"Could not initialize repository {target_repo_name} with branch {target_branch}")
+                        logger.info("Creating README.md to initialize %s with %s branch", target_repo_name, target_branch)
+                        # The contents API returns the commit it made on the branch
+                        readme = self.create_readme_file(target_repo_name, branch=target_branch)
+                        target_latest_commit = readme["commit"]["sha"]
+                        logger.info("Successfully created branch %s in %s with commit %s", target_branch, target_repo_name, target_latest_commit)
                     else:
                         raise
                 
@@ -667,47 +1160,44 @@ This repository was created automatically by the template automation system.
                 base_commit = self._request("GET", base_tree_url)
                 base_tree_sha = base_commit["tree"]["sha"]
                 
-                # Create new tree entries for all files
-                tree_entries = []
-                
-                # Process each file
-                for file_item in files:
-                    file_path = file_item["path"]
-                    file_sha = file_item["sha"]
-                    
-                    # Skip .git directory and other metadata files if they exist
-                    if file_path.startswith(".git/") or file_path == ".git":
-                        continue
-                    
-                    # Get the file content using the blob SHA
-                    try:
-                        blob_url = f"/api/v3/repos/{self.org_name}/{source_repo_name}/git/blobs/{file_sha}"
-                        blob_data = self._request("GET", blob_url)
-                        
-                        # Create tree entry for this file
-                        tree_entries.append({
-                            "path": file_path,
-                            "mode": "100644",  # Regular file
-                            "type": "blob",
-                            "content": base64.b64decode(blob_data.get("content", "")).decode("utf-8") if blob_data.get("encoding") == "base64" else ""
-                        })
-                    except Exception as blob_err:
-                        logger.error(f"Failed to get blob for file {file_path}: {str(blob_err)}")
-                        # Continue with other files
-                
-                # Create a new tree with all files
-                logger.info(f"Creating tree with {len(tree_entries)} files in {target_repo_name}")
                 create_tree_url = f"/api/v3/repos/{self.org_name}/{target_repo_name}/git/trees"
-                new_tree = self._request("POST", create_tree_url, json={
-                    "base_tree": base_tree_sha,
-                    "tree": tree_entries
-                })
+                tree_sha = None
+                if shares_objects:
+                    # Reference the source blobs by SHA so the tree is built in
+                    # one request without downloading any file contents
+                    tree_entries = [
+                        {"path": item["path"], "mode": item["mode"], "type": "blob", "sha": item["sha"]}
+                        for item in files
+                    ]
+                    logger.info("Creating tree with %s files in %s", len(tree_entries), target_repo_name)
+                    try:
+                        tree_sha = self._request("POST", create_tree_url, json={
+                            "base_tree": base_tree_sha,
+                            "tree": tree_entries
+                        })["sha"]
+                    except requests.exceptions.HTTPError as tree_err:
+                        if tree_err.response is None or tree_err.response.status_code != 422:
+                            raise
+                        logger.info("Source blobs not available in %s, copying file contents", target_repo_name)
+
+                if tree_sha is None:
+                    # Build the tree in chunks, each layered on the previous one,
+                    # so only one chunk of file contents is held at a time
+                    tree_sha = base_tree_sha
+                    for start in range(0, len(files), TREE_CHUNK_SIZE):
+                        chunk = files[start:start + TREE_CHUNK_SIZE]
+                        tree_entries = self._content_tree_entries(source_repo_name, target_repo_name, chunk)
+                        logger.info("Creating tree with %s files in %s", len(tree_entries), target_repo_name)
+                        tree_sha = self._request("POST", create_tree_url, json={
+                            "base_tree": tree_sha,
+                            "tree": tree_entries
+                        })["sha"]
                 
                 # Create a new commit with this tree
                 create_commit_url = f"/api/v3/repos/{self.org_name}/{target_repo_name}/git/commits"
                 new_commit = self._request("POST", create_commit_url, json={
                     "message": commit_message,
-                    "tree": new_tree["sha"],
+                    "tree": tree_sha,
                     "parents": [target_latest_commit],
                     "author": {
                         "name": self.commit_author_name,
@@ -720,23 +1210,23 @@ This repository was created automatically by the template automation system.
                 })
                 
                 # Update the branch reference to point to the new commit
-                logger.info(f"Updating branch {target_branch} in {target_repo_name} to new commit")
+                logger.info("Updating branch %s in %s to new commit", target_branch, target_repo_name)
                 ref_url = f"/api/v3/repos/{self.org_name}/{target_repo_name}/git/refs/heads/{target_branch}"
                 self._request("PATCH", ref_url, json={
                     "sha": new_commit["sha"],
                     "force": False
                 })
                 
-                logger.info(f"Successfully cloned all files from {source_repo_name} to {target_repo_name} in a single commit")
-                return
+                logger.info("Successfully cloned all files from %s to %s in a single commit", source_repo_name, target_repo_name)
+                return new_commit["sha"]
                 
             except requests.exceptions.HTTPError as branch_err:
-                logger.error(f"Failed to get branch {source_branch} from {source_repo_name}: {str(branch_err)}")
+                logger.error("Failed to get branch %s from %s: %s", source_branch, source_repo_name, branch_err)
                 raise ValueError(f"Source branch {source_branch} does not exist in repository {source_repo_name}")
                 
         except requests.exceptions.HTTPError as repo_err:
-            logger.error(f"Failed to get source repository {source_repo_name}: {str(repo_err)}")
+            logger.error("Failed to get source repository %s: %s", source_repo_name, repo_err)
             raise ValueError(f"Source repository {source_repo_name} does not exist")
         except Exception as e:
-            logger.error(f"Unexpected error during repository cloning: {str(e)}")
+            logger.error("Unexpected error during repository cloning: %s", e)
             raise
@@ -2,10 +2,13 @@
 
 import os
 import json
+import logging
 from typing import Dict, Any, List, Optional
 from jinja2 import Environment, FileSystemLoader, Template
 from pydantic import ValidationError
-from .models import WorkflowConfig, PRConfig, TemplateConfig
+from .models import WorkflowConfig, TemplateConfig
+
+logger = logging.getLogger(__name__)
 
 class TemplateManager:
     """Handles the management and rendering of templates for workflows and pull requests.
@@ -36,10 +39,10 @@ class TemplateManager:
             effective_template_root = default_template_path
         else:
             # template_root is not a string and not None (e.g., a tuple was passed)
-            print(
-                f"Warning: TemplateManager's template_root argument expected str or None, "
-                f"but received type {type(template_root)}. Using default template path: "
-                f"'{default_template_path}'"
+            logger.warning(
+                "TemplateManager's template_root argument expected str or None, "
+                "but received type %s. Using default template path: '%s'",
+                type(template_root), default_template_path
             )
             effective_template_root = default_template_path
 
@@ -50,6 +53,8 @@ class TemplateManager:
         )
         self.template_repo_name = template_repo_name
         self.config = self._load_template_config()
+        # Compiled string templates by source, so warm invocations reuse them
+        self._string_templates: Dict[str, Template] = {}
 
     def _load_template_config(self) -> TemplateConfig:
         """Load the template configuration from a .template-config.json file.
@@ -68,10 +73,10 @@ class TemplateManager:
                     return TemplateConfig(**template_config)
             return TemplateConfig()  # Use defaults if no config file exists
         except ValidationError as e:
-            print(f"Warning: Template config validation failed: {str(e)}")
+            logger.warning("Template config validation failed: %s", e)
             return TemplateConfig()  # Use defaults on validation error
         except Exception as e:
-            print(f"Warning: Could not load template config: {str(e)}")
+            logger.warning("Could not load template config: %s", e)
             return TemplateConfig()  # Use defaults on any other error
 
     def render_workflow(self, workflow: WorkflowConfig) -> str:
@@ -104,8 +109,8 @@ class TemplateManager:
         }
 
         return {
-            "title": self.env.from_string(pr_config.title_template).render(**variables),
-            "body": self.env.from_string(pr_config.body_template).render(**variables),
+            "title": self._compile_string(pr_config.title_template).render(**variables),
+            "body": self._compile_string(pr_config.body_template).render(**variables),
             "base_branch": pr_config.base_branch,
             "branch_name": f"{pr_config.branch_prefix}-{repo_name}",
             "labels": pr_config.labels,
@@ -113,6 +118,20 @@ class TemplateManager:
             "assignees": pr_config.assignees
         }
 
+    def _compile_string(self, source: str) -> Template:
+        """Compile a template from a string, reusing an earlier compilation of the same source.
+
+        Args:
+            source (str): The template source.
+
+        Returns:
+            Template: The compiled template.
+        """
+        template = self._string_templates.get(source)
+        if template is None:
+            template = self._string_templates[source] = self.env.from_string(source)
+        return template
+
     def get_workflow_configs(self) -> List[WorkflowConfig]:
         """Retrieve workflow configurations from the template configuration.
 
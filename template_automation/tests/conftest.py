@@ -1,14 +1,21 @@
 import os
 import pytest
-from github import Github
 import time
 
+# app.py checks these at import time; the unit tests never reach a real server
+os.environ.setdefault("GITHUB_API", "https://api.github.example.com/api/v3")
+os.environ.setdefault("GITHUB_ORG_NAME", "test-org")
+os.environ.setdefault("TEMPLATE_REPO_NAME", "template-repo")
+os.environ.setdefault("GITHUB_TOKEN_SECRET_NAME", "test/github-token")
+
 @pytest.fixture(scope="session")
 def github_client():
     """Create a GitHub client for integration tests."""
     token = os.environ.get("GITHUB_TOKEN")
     if not token:
         pytest.skip("GITHUB_TOKEN environment variable not set")
+    # PyGithub is only needed by the integration tests
+    from github import Github
     
     api_url = os.environ.get("GITHUB_API", "https://api.github.com")
     return Github(base_url=api_url, login_or_token=token)
@@ -53,10 +60,7 @@ def github_client_params():
         "token": "test-token",
         "org_name": "test-org",
         "commit_author_name": "Test Author",
-        "commit_author_email": "test@example.com",
-        "source_version": "v1.0.0",
-        "template_repo_name": "template-repo",
-        "config_file_name": "config.json"
+        "commit_author_email": "test@example.com"
     }
 
 @pytest.fixture
@@ -70,41 +74,6 @@ def mock_repository_response():
         "description": "Test repository"
     }
 
-@pytest.fixture
-def mock_tree_response():
-    """Fixture providing a standard tree API response"""
-    return {
-        "sha": "test-tree-sha",
-        "tree": [
-            {
-                "path": "test.txt",
-                "mode": "100644",
-                "type": "blob",
-                "sha": "test-blob-sha",
-                "size": 100
-            }
-        ]
-    }
-
-@pytest.fixture
-def mock_blob_response():
-    """Fixture providing a standard blob API response"""
-    return {
-        "sha": "test-blob-sha",
-        "content": "SGVsbG8gV29ybGQh",  # Base64 encoded "Hello World!"
-        "encoding": "base64"
-    }
-
-@pytest.fixture
-def mock_commit_response():
-    """Fixture providing a standard commit API response"""
-    return {
-        "sha": "test-commit-sha",
-        "tree": {
-            "sha": "test-tree-sha"
-        }
-    }
-
 @pytest.fixture
 def mock_reference_response():
     """Fixture providing a standard reference API response"""
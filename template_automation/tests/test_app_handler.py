@@ -0,0 +1,126 @@
+import base64
+import json
+import threading
+
+import pytest
+
+from .. import app, github_client
+
+API = "https://github.example.com"
+REPOS = f"{API}/api/v3/repos/test-org"
+EVENT = {"project_name": "new-service", "template_settings": {"region": "us-east-1"}}
+CONFIG = json.dumps(EVENT["template_settings"], indent=2)
+
+
+@pytest.fixture(autouse=True)
+def handler_env(monkeypatch):
+    """Point the handler at a mocked server with a cached token and empty caches"""
+    monkeypatch.setattr(app, "GITHUB_API", f"{API}/api/v3")
+    monkeypatch.setattr(app, "GITHUB_ORG_NAME", "test-org")
+    monkeypatch.setattr(app, "TEMPLATE_REPO_NAME", "template-repo")
+    monkeypatch.setattr(app, "_TOKEN_CACHE", {"value": "test-token", "expires_at": float("inf"),
+                                              "lock": threading.Lock()})
+    monkeypatch.setattr(app, "_GITHUB_CLIENTS", {})
+    monkeypatch.setattr(app, "_COMPLETED_REQUESTS", {})
+    monkeypatch.setattr(github_client, "_etag_cache", github_client.OrderedDict())
+    monkeypatch.setattr(github_client, "_template_tree_cache", github_client.OrderedDict())
+    monkeypatch.setattr(github_client.time, "sleep", lambda seconds: None)
+    app.get_static_github_config.cache_clear()
+    yield
+    app.get_static_github_config.cache_clear()
+
+
+@pytest.fixture
+def github(requests_mock):
+    """Template repository and the calls shared by every handler run"""
+    def graphql(request, context):
+        query = request.json()["query"]
+        if "createCommitOnBranch" in query:
+            return {"data": {"createCommitOnBranch": {"commit": {"oid": "config-commit", "url": "u"}}}}
+        if "isBinary" in query:
+            return {"data": {"repository": {"b0": {"text": "# Template", "isBinary": False, "isTruncated": False}}}}
+        return {"data": {"repository": {"name": "template-repo", "url": "u",
+                                        "defaultBranchRef": {"name": "main", "target": {"oid": "template-commit"}}}}}
+
+    requests_mock.post(f"{API}/api/graphql", json=graphql)
+    requests_mock.get(f"{REPOS}/template-repo/git/trees/template-commit?recursive=1",
+                      json={"tree": [{"path": "README.md", "mode": "100644", "type": "blob", "sha": "b1"}]})
+    requests_mock.put(f"{REPOS}/new-service/topics", json={})
+    requests_mock.post(f"{REPOS}/new-service/git/refs", json={})
+    requests_mock.post(f"{REPOS}/new-service/pulls", json={"number": 1, "html_url": "https://pr/1"})
+    return requests_mock
+
+
+def calls(requests_mock, method, suffix):
+    return [request for request in requests_mock.request_history
+            if request.method == method and request.path.endswith(suffix)]
+
+
+class TestLambdaHandler:
+    """Retries and the template generate path of lambda_handler"""
+
+    def test_retry_resumes_an_existing_repo_init_branch(self, github):
+        github.get(f"{REPOS}/new-service", json={"name": "new-service", "default_branch": "main",
+                                                 "html_url": "https://repo", "topics": ["infrastructure"]})
+        github.get(f"{REPOS}/new-service/branches/repo-init", json={"commit": {"sha": "init-commit"}})
+        github.get(f"{REPOS}/new-service/contents/config.json?ref=repo-init",
+                   json={"content": base64.b64encode(CONFIG.encode()).decode()})
+        github.get(f"{REPOS}/new-service/pulls", json=[{"number": 7, "html_url": "https://pr/7"}])
+
+        result = app.lambda_handler(dict(EVENT), None)
+
+        assert result == {"repository_url": "https://repo", "pull_request_url": "https://pr/7"}
+        assert not calls(github, "GET", "/git/trees/template-commit")
+        assert not calls(github, "POST", "/new-service/git/refs")
+        assert not calls(github, "POST", "/new-service/pulls")
+        assert all("createCommitOnBranch" not in request.json()["query"]
+                   for request in calls(github, "POST", "/api/graphql"))
+
+    def test_retry_commits_config_that_differs(self, github):
+        github.get(f"{REPOS}/new-service", json={"name": "new-service", "default_branch": "main",
+                                                 "html_url": "https://repo"})
+        github.get(f"{REPOS}/new-service/branches/repo-init", json={"commit": {"sha": "init-commit"}})
+        github.get(f"{REPOS}/new-service/contents/config.json?ref=repo-init", status_code=404, json={})
+        github.get(f"{REPOS}/new-service/pulls", json=[])
+
+        result = app.lambda_handler(dict(EVENT), None)
+
+        assert result["pull_request_url"] == "https://pr/1"
+        commit = next(request.json() for request in calls(github, "POST", "/api/graphql")
+                      if "createCommitOnBranch" in request.json()["query"])
+        assert commit["variables"]["input"]["expectedHeadOid"] == "init-commit"
+
+    def test_slow_generated_repository_is_resumed_without_writes(self, github, monkeypatch):
+        monkeypatch.setattr(app, "GENERATED_BRANCH_TIMEOUT_SECONDS", 0)
+        github.get(f"{REPOS}/new-service", status_code=404, json={})
+        github.post(f"{REPOS}/template-repo/generate", json={"name": "new-service", "default_branch": "main",
+                                                             "html_url": "https://repo"})
+        github.get(f"{REPOS}/new-service/branches/main", status_code=404, json={})
+
+        with pytest.raises(ValueError):
+            app.lambda_handler(dict(EVENT), None)
+        assert not calls(github, "POST", "/new-service/git/refs")
+
+        # The retry finds the repository GitHub has since populated
+        github.get(f"{REPOS}/new-service", json={"name": "new-service", "default_branch": "main",
+                                                 "html_url": "https://repo",
+                                                 "template_repository": {"name": "template-repo"}})
+        github.get(f"{REPOS}/new-service/branches/repo-init", status_code=404, json={})
+        github.get(f"{REPOS}/new-service/branches/main", json={"commit": {"sha": "template-copy"}})
+
+        result = app.lambda_handler(dict(EVENT), None)
+
+        assert result == {"repository_url": "https://repo", "pull_request_url": "https://pr/1"}
+        assert len(calls(github, "POST", "/template-repo/generate")) == 1
+        (branch,) = calls(github, "POST", "/new-service/git/refs")
+        assert branch.json() == {"ref": "refs/heads/repo-init", "sha": "template-copy"}
+        assert not calls(github, "PUT", "/new-service/contents/README.md")
+        assert not calls(github, "POST", "/new-service/git/trees")
+        assert not calls(github, "POST", "/new-service/git/commits")
+
+    def test_generated_branch_wait_leaves_time_for_the_rest(self, monkeypatch):
+        context = type("Context", (), {"get_remaining_time_in_millis": lambda self: 30000})()
+        monkeypatch.setattr(app, "GENERATED_BRANCH_TIMEOUT_SECONDS", 60)
+
+        assert app.get_generated_branch_timeout(context) == 15
+        assert app.get_generated_branch_timeout(None) == 60
@@ -0,0 +1,86 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from .. import app
+
+
+@pytest.fixture
+def secrets_client(monkeypatch):
+    """Secrets Manager client returning a new token on each call"""
+    client = MagicMock()
+    client.get_secret_value.side_effect = [{"SecretString": f"token-{n}"} for n in range(1, 10)]
+    monkeypatch.setattr(app, "_get_secrets_client", lambda: client)
+    monkeypatch.setattr(app, "SECRETS_EXTENSION_PORT", None)
+    return client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the token cache"""
+    now = [1000.0]
+    monkeypatch.setattr(app.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache(monkeypatch):
+    """Start every test without a cached token"""
+    monkeypatch.setattr(app, "_TOKEN_CACHE", {"value": None, "expires_at": 0.0, "lock": threading.Lock()})
+
+
+def wait_for_refresh():
+    """Block until a background refresh has released the refresh lock"""
+    lock = app._TOKEN_CACHE["lock"]
+    assert lock.acquire(timeout=5)
+    lock.release()
+
+
+class TestGetGithubToken:
+    """Caching and stale-while-revalidate refresh of the GitHub token"""
+
+    def test_fresh_token_is_reused(self, secrets_client, clock):
+        assert app.get_github_token() == "token-1"
+        clock[0] += app.TOKEN_CACHE_TTL_SECONDS - 1
+
+        assert app.get_github_token() == "token-1"
+        assert secrets_client.get_secret_value.call_count == 1
+        secrets_client.get_secret_value.assert_called_with(SecretId=app.GITHUB_TOKEN_SECRET_NAME)
+
+    def test_stale_token_is_served_while_refreshing_in_background(self, secrets_client, clock):
+        app.get_github_token()
+        clock[0] += app.TOKEN_CACHE_TTL_SECONDS + 1
+
+        assert app.get_github_token() == "token-1"
+        wait_for_refresh()
+        assert app._TOKEN_CACHE["value"] == "token-2"
+        assert app.get_github_token() == "token-2"
+
+    def test_only_one_refresh_runs_at_a_time(self, secrets_client, clock):
+        app.get_github_token()
+        clock[0] += app.TOKEN_CACHE_TTL_SECONDS + 1
+        app._TOKEN_CACHE["lock"].acquire()
+        try:
+            assert app.get_github_token() == "token-1"
+            assert app.get_github_token() == "token-1"
+        finally:
+            app._TOKEN_CACHE["lock"].release()
+
+        assert secrets_client.get_secret_value.call_count == 1
+
+    def test_failed_refresh_keeps_serving_the_cached_token(self, secrets_client, clock):
+        app.get_github_token()
+        secrets_client.get_secret_value.side_effect = RuntimeError("throttled")
+        clock[0] += app.TOKEN_CACHE_TTL_SECONDS + 1
+
+        assert app.get_github_token() == "token-1"
+        wait_for_refresh()
+        assert app._TOKEN_CACHE["value"] == "token-1"
+
+    def test_token_past_the_grace_period_is_fetched_synchronously(self, secrets_client, clock):
+        app.get_github_token()
+        clock[0] += app.TOKEN_CACHE_TTL_SECONDS + app.TOKEN_STALE_GRACE_SECONDS + 1
+
+        assert app.get_github_token() == "token-2"
+        assert secrets_client.get_secret_value.call_count == 2
@@ -0,0 +1,242 @@
+import base64
+import time
+
+import pytest
+import requests
+
+from .. import github_client
+from ..github_client import GitHubClient
+
+API = "https://github.example.com"
+REPOS = f"{API}/api/v3/repos/test-org"
+
+
+@pytest.fixture
+def client():
+    """GitHubClient pointed at a mocked server"""
+    return GitHubClient(api_base_url=API, token="test-token", org_name="test-org")
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record rate limit waits instead of sleeping"""
+    recorded = []
+    monkeypatch.setattr(github_client.time, "sleep", recorded.append)
+    return recorded
+
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    """Isolate the container-wide caches between tests"""
+    monkeypatch.setattr(github_client, "_etag_cache", github_client.OrderedDict())
+    monkeypatch.setattr(github_client, "_template_tree_cache", github_client.OrderedDict())
+
+
+class TestSendBackoff:
+    """Rate limit handling in GitHubClient._send"""
+
+    def test_secondary_limit_waits_for_retry_after(self, client, sleeps, requests_mock):
+        requests_mock.get(f"{REPOS}/repo", [
+            {"status_code": 403, "headers": {"Retry-After": "3"}, "text": "secondary rate limit"},
+            {"json": {"name": "repo"}}
+        ])
+
+        assert client.get_repository("repo")["name"] == "repo"
+        assert sleeps == [3.0]
+
+    def test_http_date_retry_after_falls_back_to_exponential_backoff(self, client, sleeps, requests_mock):
+        requests_mock.get(f"{REPOS}/repo", [
+            {"status_code": 429, "headers": {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, "text": ""},
+            {"status_code": 429, "headers": {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, "text": ""},
+            {"json": {"name": "repo"}}
+        ])
+
+        assert client.get_repository("repo")["name"] == "repo"
+        assert sleeps == [1, 2]
+
+    def test_exhausted_primary_limit_waits_until_reset(self, client, sleeps, requests_mock):
+        reset = time.time() + 5
+        requests_mock.get(f"{REPOS}/repo", [
+            {"status_code": 403, "text": "API rate limit exceeded",
+             "headers": {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}},
+            {"json": {"name": "repo"}}
+        ])
+
+        client.get_repository("repo")
+        assert len(sleeps) == 1
+        assert 0 < sleeps[0] <= 5
+
+    def test_low_remaining_on_success_does_not_pause(self, client, sleeps, requests_mock):
+        requests_mock.get(f"{REPOS}/repo", json={"name": "repo"},
+                          headers={"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "not-a-number"})
+
+        client.get_repository("repo")
+        assert sleeps == []
+
+    def test_reset_beyond_the_wait_cap_is_not_waited_for(self, client, sleeps, requests_mock):
+        requests_mock.get(f"{REPOS}/repo", status_code=403, text="API rate limit exceeded",
+                          headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 600)})
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_repository("repo")
+        assert sleeps == []
+        assert requests_mock.call_count == 1
+
+    def test_waits_stop_once_the_budget_is_spent(self, client, sleeps, requests_mock, monkeypatch):
+        monkeypatch.setattr(github_client, "RATE_LIMIT_WAIT_BUDGET", 2.5)
+        client.reset_rate_limit_budget()
+        requests_mock.get(f"{REPOS}/repo", status_code=429, headers={"Retry-After": "2"}, text="")
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_repository("repo")
+        assert sleeps == [2.0]
+
+        client.reset_rate_limit_budget()
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_repository("repo")
+        assert sleeps == [2.0, 2.0]
+
+    def test_permission_errors_are_not_retried(self, client, sleeps, requests_mock):
+        requests_mock.get(f"{REPOS}/repo", status_code=403, json={"message": "Must have admin rights"})
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_repository("repo")
+        assert sleeps == []
+        assert requests_mock.call_count == 1
+
+
+class TestConditionalRequests:
+    """ETag revalidation of conditional GETs"""
+
+    def test_not_modified_returns_the_cached_body(self, client, requests_mock):
+        requests_mock.get(f"{REPOS}/repo/branches/main", [
+            {"json": {"commit": {"sha": "abc"}}, "headers": {"ETag": '"v1"'}},
+            {"status_code": 304, "text": ""}
+        ])
+
+        first = client.get_branch("repo", "main")
+        second = client.get_branch("repo", "main")
+
+        assert second == first == {"commit": {"sha": "abc"}}
+        assert "If-None-Match" not in requests_mock.request_history[0].headers
+        assert requests_mock.request_history[1].headers["If-None-Match"] == '"v1"'
+
+    def test_cache_key_includes_query_parameters(self, client, requests_mock):
+        content = base64.b64encode(b"hello").decode()
+        requests_mock.get(f"{REPOS}/repo/contents/README.md?ref=main",
+                          json={"content": content}, headers={"ETag": '"main"'})
+        requests_mock.get(f"{REPOS}/repo/contents/README.md?ref=dev",
+                          json={"content": content}, headers={"ETag": '"dev"'})
+
+        client.get_file_contents("repo", "README.md", "main")
+        client.get_file_contents("repo", "README.md", "dev")
+
+        assert all("If-None-Match" not in request.headers for request in requests_mock.request_history)
+
+    def test_cache_is_bounded(self, client, requests_mock, monkeypatch):
+        monkeypatch.setattr(github_client, "ETAG_CACHE_SIZE", 2)
+        for name in ("a", "b", "c"):
+            requests_mock.get(f"{REPOS}/{name}", json={"name": name}, headers={"ETag": f'"{name}"'})
+            client.get_repository(name)
+
+        assert len(github_client._etag_cache) == 2
+        assert not any(key.startswith(f"{REPOS}/a?") for key in github_client._etag_cache)
+
+
+class TestCloneRepositoryContents:
+    """Copying template files into a new repository"""
+
+    FILES = [
+        {"path": "README.md", "mode": "100644", "type": "blob", "sha": "blob-readme"},
+        {"path": "logo.png", "mode": "100644", "type": "blob", "sha": "blob-logo"},
+        {"path": ".git/config", "mode": "100644", "type": "blob", "sha": "blob-git"},
+        {"path": "docs", "mode": "040000", "type": "tree", "sha": "tree-docs"}
+    ]
+
+    @pytest.fixture
+    def mocked_repos(self, requests_mock):
+        requests_mock.get(f"{REPOS}/template/git/trees/src-commit?recursive=1", json={"tree": self.FILES})
+        requests_mock.get(f"{REPOS}/target/branches/main", json={"commit": {"sha": "target-commit"}})
+        requests_mock.get(f"{REPOS}/target/git/commits/target-commit", json={"tree": {"sha": "target-tree"}})
+        requests_mock.post(f"{API}/api/graphql", json={"data": {"repository": {
+            "b0": {"text": "# Template", "isBinary": False, "isTruncated": False},
+            "b1": {"text": None, "isBinary": True, "isTruncated": False}
+        }}})
+        requests_mock.get(f"{REPOS}/template/git/blobs/blob-logo",
+                          json={"content": "iVBORw0K\nGgo=\n", "encoding": "base64"})
+        requests_mock.post(f"{REPOS}/target/git/blobs", json={"sha": "copied-logo"})
+        requests_mock.post(f"{REPOS}/target/git/commits", json={"sha": "new-commit"})
+        requests_mock.patch(f"{REPOS}/target/git/refs/heads/main", json={})
+        return requests_mock
+
+    def tree_posts(self, requests_mock):
+        return [request.json() for request in requests_mock.request_history
+                if request.method == "POST" and request.url.endswith("/git/trees")]
+
+    def test_copies_contents_without_trying_blob_references(self, client, mocked_repos):
+        mocked_repos.post(f"{REPOS}/target/git/trees", json={"sha": "new-tree"})
+
+        sha = client.clone_repository_contents("template", "target", source_sha="src-commit")
+
+        assert sha == "new-commit"
+        (tree,) = self.tree_posts(mocked_repos)
+        assert tree["base_tree"] == "target-tree"
+        assert tree["tree"] == [
+            {"path": "README.md", "mode": "100644", "type": "blob", "content": "# Template"},
+            {"path": "logo.png", "mode": "100644", "type": "blob", "sha": "copied-logo"}
+        ]
+        blob_upload = next(request for request in mocked_repos.request_history
+                           if request.url.endswith("/target/git/blobs"))
+        assert blob_upload.json() == {"content": "iVBORw0KGgo=", "encoding": "base64"}
+
+    def test_shared_objects_are_referenced_by_sha(self, client, mocked_repos):
+        mocked_repos.post(f"{REPOS}/target/git/trees", json={"sha": "new-tree"})
+
+        client.clone_repository_contents("template", "target", source_sha="src-commit", shares_objects=True)
+
+        (tree,) = self.tree_posts(mocked_repos)
+        assert [entry["sha"] for entry in tree["tree"]] == ["blob-readme", "blob-logo"]
+        assert not any(request.url.endswith("/api/graphql") for request in mocked_repos.request_history)
+
+    def test_falls_back_to_contents_when_blob_references_are_rejected(self, client, mocked_repos):
+        mocked_repos.post(f"{REPOS}/target/git/trees", [
+            {"status_code": 422, "json": {"message": "tree.sha blob-readme is not a valid blob"}},
+            {"json": {"sha": "new-tree"}}
+        ])
+
+        client.clone_repository_contents("template", "target", source_sha="src-commit", shares_objects=True)
+
+        by_sha, by_content = self.tree_posts(mocked_repos)
+        assert "sha" in by_sha["tree"][0]
+        assert by_content["tree"][0]["content"] == "# Template"
+        commit = next(request.json() for request in mocked_repos.request_history
+                      if request.url.endswith("/target/git/commits"))
+        assert commit["tree"] == "new-tree"
+        assert commit["parents"] == ["target-commit"]
+
+    def test_template_listing_is_reused_for_the_same_commit(self, client, mocked_repos):
+        mocked_repos.post(f"{REPOS}/target/git/trees", json={"sha": "new-tree"})
+
+        client.clone_repository_contents("template", "target", source_sha="src-commit")
+        client.clone_repository_contents("template", "target", source_sha="src-commit")
+
+        listings = [request for request in mocked_repos.request_history
+                    if request.path.endswith("/template/git/trees/src-commit")]
+        assert len(listings) == 1
+        assert len(self.tree_posts(mocked_repos)) == 2
+
+    def test_large_templates_are_built_in_chained_chunks(self, client, mocked_repos, monkeypatch):
+        monkeypatch.setattr(github_client, "TREE_CHUNK_SIZE", 1)
+        mocked_repos.post(f"{REPOS}/target/git/trees", [{"json": {"sha": "tree-1"}}, {"json": {"sha": "tree-2"}}])
+        mocked_repos.post(f"{API}/api/graphql", json={"data": {"repository": {
+            "b0": {"text": "# Template", "isBinary": False, "isTruncated": False}
+        }}})
+
+        client.clone_repository_contents("template", "target", source_sha="src-commit")
+
+        first, second = self.tree_posts(mocked_repos)
+        assert first["base_tree"] == "target-tree"
+        assert second["base_tree"] == "tree-1"
+        commit = next(request.json() for request in mocked_repos.request_history
+                      if request.url.endswith("/target/git/commits"))
+        assert commit["tree"] == "tree-2"